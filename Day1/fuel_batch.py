@@ -0,0 +1,83 @@
+"""
+Batch fuel calculator for question 1 and question 2.
+
+question1.py and question2.py work on one module mass at a time, with question2.calculate_full_fuel_requirement()
+recursing once per fuel step. Here a whole manifest of module masses is handled at once:
+    * With NumPy installed, the "divide by three, round down, and subtract 2" step is applied to the whole array of
+      masses. For question 2 the step is repeated on the array, dropping the masses whose fuel reached 0 or less, until
+      none are left. Only about a dozen steps are needed even for very large masses.
+    * Without NumPy, every mass goes through full_fuel_requirement(), which remembers the answer for masses it has
+      already seen.
+
+Both give the same totals as question1.totalUp() and question2.calculate_full_fuel_requirement(). Like question1, the
+question 1 total adds the fuel of every module as is, even when a very small mass gives a negative fuel value.
+"""
+
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def calculate_fuel_requirement(mass):
+    return mass // 3 - 2
+
+
+@lru_cache(maxsize=65536)
+def full_fuel_requirement(module_mass):
+    """
+    Same as question2.calculate_full_fuel_requirement() but without recursion, and remembering the results for the
+    most recently used masses.
+
+    :param module_mass: Mass of a module.
+    :return: Fuel required by the module and by the fuel added for it.
+    """
+    total = 0
+    fuel = calculate_fuel_requirement(module_mass)
+    while fuel > 0:
+        total += fuel
+        fuel = calculate_fuel_requirement(fuel)
+    return total
+# end full_fuel_requirement()
+
+
+def _fuel_totals_numpy(masses):
+    if not isinstance(masses, np.ndarray):
+        masses = np.fromiter(masses, dtype=np.int64)
+
+    fuel = calculate_fuel_requirement(masses.astype(np.int64, copy=False))
+    part_one = int(fuel.sum())
+
+    part_two = 0
+    fuel = fuel[fuel > 0]
+    while fuel.size:
+        part_two += int(fuel.sum())
+        fuel = calculate_fuel_requirement(fuel)
+        fuel = fuel[fuel > 0]
+
+    return part_one, part_two
+# end _fuel_totals_numpy()
+
+
+def _fuel_totals_python(masses):
+    part_one, part_two = 0, 0
+    for mass in masses:
+        part_one += calculate_fuel_requirement(mass)
+        part_two += full_fuel_requirement(mass)
+    return part_one, part_two
+# end _fuel_totals_python()
+
+
+def fuel_totals(masses):
+    """
+    Total fuel requirements of a manifest of module masses for question 1 and question 2.
+
+    :param masses: Any iterable of module masses, or a NumPy array of them.
+    :return: (question 1 total, question 2 total).
+    """
+    if np is not None:
+        return _fuel_totals_numpy(masses)
+    return _fuel_totals_python(masses)
+# end fuel_totals()
@@ -0,0 +1,199 @@
+"""
+Fuel totals of question 1 and question 2 over many manifest files.
+
+Every manifest file holds module masses, one per line, like the puzzle input. The files are the shards of the job: each
+one is handed to a worker process, which streams it through puzzle_input.iter_masses() BATCH_SIZE masses at a time and
+adds up fuel_batch.fuel_totals() of the batches. The parent process only collects the totals of every file and adds
+them up, so the work spreads over the cores and each worker is bound by reading its files.
+
+With a checkpoint file, the totals of every file are appended to it as a JSON line as soon as the file is done. Running
+again with the same checkpoint skips the files found in it, as long as their size and modification time did not change,
+so an interrupted run resumes where it stopped.
+
+Usage:
+    python -m Day1.fuel_shards [--workers N] [--checkpoint FILE] [--quiet] DIRECTORY_OR_GLOB...
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
+
+import puzzle_input
+from Day1 import fuel_batch
+
+# Masses handed to fuel_batch.fuel_totals() at a time.
+BATCH_SIZE = 1 << 16
+
+
+def find_manifests(patterns, exclude=()):
+    """
+    List the manifest files to process.
+
+    :param patterns: Directories, whose files are all taken, or glob patterns like "manifests/*.txt".
+    :param exclude: Paths of files that are not manifests even if they match, like the checkpoint file.
+    :return: A sorted list of absolute file paths, without duplicates.
+    """
+    exclude = {os.path.abspath(path) for path in exclude if path is not None}
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            candidates = (os.path.join(pattern, name) for name in os.listdir(pattern))
+        else:
+            candidates = glob.glob(pattern, recursive=True)
+        paths.update(os.path.abspath(path) for path in candidates if os.path.isfile(path))
+    return sorted(paths - exclude)
+# end find_manifests()
+
+
+def _fingerprint(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def shard_totals(path, batch_size=BATCH_SIZE):
+    """
+    Fuel totals of a single manifest file. Runs in a worker process.
+
+    :param path: Path of the manifest file.
+    :param batch_size: Number of masses read into memory at a time.
+    :return: A dictionary with the path, question 1 and question 2 totals, number of masses, and the size and
+    modification time the file had when it was read.
+    """
+    fingerprint = _fingerprint(path)
+    part_one, part_two, mass_count = 0, 0, 0
+
+    masses = puzzle_input.iter_masses(path)
+    while batch := list(islice(masses, batch_size)):
+        batch_one, batch_two = fuel_batch.fuel_totals(batch)
+        part_one += batch_one
+        part_two += batch_two
+        mass_count += len(batch)
+
+    return {"path": path, "part_one": part_one, "part_two": part_two, "masses": mass_count, **fingerprint}
+# end shard_totals()
+
+
+def load_checkpoint(checkpoint):
+    """
+    Read the totals of the files completed by a previous run.
+
+    :param checkpoint: Path of the checkpoint file. It does not need to exist.
+    :return: A dictionary of absolute path -> totals as returned by shard_totals(), for the files that did not change
+    since.
+    """
+    completed = {}
+    if checkpoint is None or not os.path.exists(checkpoint):
+        return completed
+
+    with open(checkpoint) as file:
+        for line in file:
+            try:
+                totals = json.loads(line)
+            except json.JSONDecodeError:
+                # The last line is cut short when a run was stopped while writing it.
+                continue
+            totals["path"] = os.path.abspath(totals["path"])
+            completed[totals["path"]] = totals
+
+    for path, totals in list(completed.items()):
+        if not os.path.isfile(path) or _fingerprint(path) != {"size": totals["size"], "mtime_ns": totals["mtime_ns"]}:
+            del completed[path]
+    return completed
+# end load_checkpoint()
+
+
+def run_shards(paths, workers=None, checkpoint=None, on_done=None):
+    """
+    Compute the fuel totals of every manifest file in a process pool.
+
+    :param paths: Paths of the manifest files. They are made absolute, as in the checkpoint and the results.
+    :param workers: Number of worker processes. Defaults to the number of CPUs.
+    :param checkpoint: Optional path of the checkpoint file to resume from and to append completed files to.
+    :param on_done: Optional function called with the totals of every file as soon as they are known, including the
+    files taken from the checkpoint.
+    :return: (dictionary of path -> totals of every file, dictionary of path -> error for the files that failed).
+    """
+    paths = list(dict.fromkeys(os.path.abspath(path) for path in paths))
+    completed = load_checkpoint(checkpoint)
+    results = {}
+    errors = {}
+
+    for path in paths:
+        if path in completed:
+            results[path] = completed[path]
+            if on_done is not None:
+                on_done(completed[path])
+    remaining = [path for path in paths if path not in results]
+    if not remaining:
+        return results, errors
+
+    checkpoint_file = open(checkpoint, "a") if checkpoint is not None else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(shard_totals, path): path for path in remaining}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    totals = future.result()
+                except Exception as error:
+                    errors[path] = error
+                    continue
+
+                results[path] = totals
+                if checkpoint_file is not None:
+                    checkpoint_file.write(json.dumps(totals) + "\n")
+                    checkpoint_file.flush()
+                if on_done is not None:
+                    on_done(totals)
+    finally:
+        if checkpoint_file is not None:
+            checkpoint_file.close()
+
+    return results, errors
+# end run_shards()
+
+
+def grand_totals(results):
+    """
+    :param results: Dictionary of path -> totals as returned by run_shards().
+    :return: (question 1 total, question 2 total, number of masses) of all the files.
+    """
+    return (sum(totals["part_one"] for totals in results.values()),
+            sum(totals["part_two"] for totals in results.values()),
+            sum(totals["masses"] for totals in results.values()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m Day1.fuel_shards",
+                                     description="Fuel totals of question 1 and question 2 over many manifest files.")
+    parser.add_argument("manifests", nargs="+", help="directories or glob patterns of the manifest files")
+    parser.add_argument("--workers", type=int, help="number of worker processes (default: number of CPUs)")
+    parser.add_argument("--checkpoint", help="file recording the completed files, to resume an interrupted run")
+    parser.add_argument("--quiet", action="store_true", help="only print the grand totals")
+    args = parser.parse_args(argv)
+
+    # The checkpoint may be kept next to the manifests, but it is not one of them.
+    paths = find_manifests(args.manifests, exclude=[args.checkpoint])
+    if not paths:
+        parser.error("no manifest files found")
+
+    def print_file(totals):
+        if not args.quiet:
+            print(f"{totals['path']}\t{totals['part_one']}\t{totals['part_two']}", flush=True)
+
+    results, errors = run_shards(paths, args.workers, args.checkpoint, print_file)
+    part_one, part_two, mass_count = grand_totals(results)
+    print(f"total\t{part_one}\t{part_two}\t({len(results)} files, {mass_count} masses)")
+
+    for path, error in sorted(errors.items()):
+        print(f"{path}: {type(error).__name__}: {error}", file=sys.stderr)
+    return 1 if errors else 0
+# end main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -32,9 +32,13 @@ where __main__ refers to your current module p_03_using_bisection_search.py.
 
 So, omit the dot when importing a file from the current directory.
 MUST have an __init__.py for your files to become modules and __init__.py can be empty.
+
+The solutions are now run from the repository root (python -m Day1.question2), so files from the same directory are
+imported with the package name: from Day1 import question1.
 """
 
-import question1
+import puzzle_input
+from Day1 import question1
 
 def calculate_full_fuel_requirement(module_mass):
     result = question1.calculate_fuel_requirement(module_mass)
@@ -43,8 +47,17 @@ def calculate_full_fuel_requirement(module_mass):
     return result + calculate_full_fuel_requirement(result)
 
 
-full_fuel_list = []
-for mass in question1.module_mass_list:
-    full_fuel_list.append(calculate_full_fuel_requirement(mass))
+def main(module_masses=None):
+    """
+    :param module_masses: Iterable of module masses. Defaults to streaming them from the puzzle input file.
+    """
+    if module_masses is None:
+        module_masses = puzzle_input.iter_masses(question1.INPUT_FILE)
+
+    full_fuel_list = map(calculate_full_fuel_requirement, module_masses)
+    print(question1.totalUp(full_fuel_list))
+# end main()
+
 
-print(question1.totalUp(full_fuel_list))
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Run an add/multiply Intcode program for many noun/verb pairs at once with NumPy.
+
+The instructions an add/multiply program runs do not depend on the noun and verb, as long as the program does not
+overwrite its own code (see intcode_compiler.py). Every run of the noun/verb search in question2.py then goes through
+the same instructions, so all of them can run in lockstep. BatchIntcodeVM holds one row of memory per run in a 2-D
+array (runs x addresses, stored column by column so that an address of every run is contiguous) and runs every
+instruction for all the rows at once:
+    * a parameter at a fixed position reads a whole column.
+    * a parameter at a patched address (1 or 2) holds a different position in every row, so the values are gathered
+      with memory[rows, positions]. A write to such a parameter is scattered the same way.
+
+A run that does something the batch cannot follow falls back to IntcodeVM on its own, while the others stay in the
+batch:
+    * a position read from a patched address that is outside of memory, or a write through one that would overwrite code
+      still to be run.
+    * a value that overflows the 64-bit integers of the array.
+A program that cannot be compiled by intcode_compiler.py runs every pair in IntcodeVM. The results are always the same
+as IntcodeVM.run(); a run that goes past the end of memory gives None instead of raising IndexError.
+
+NumPy is optional for the rest of the repository and only needed by this module.
+"""
+
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from Day2 import intcode
+from Day2 import intcode_compiler
+from Day2 import question2
+
+INT64_LIMIT = 2.0 ** 63
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("The batch Intcode VM needs NumPy. Install it with: pip install numpy")
+
+
+class BatchIntcodeVM:
+    """
+    Runs an Intcode program for a batch of noun/verb pairs.
+
+    :param program: The Intcode program as a list of integers.
+    """
+
+    patched = (1, 2)
+
+    def __init__(self, program):
+        _require_numpy()
+        self.program = list(program)
+        self.vm = intcode.IntcodeVM(self.program)
+        self.steps = self._plan()
+
+    def _plan(self):
+        """
+        Decode the program into the steps run on the batch.
+
+        :return: A list of (opcode, first parameter, second parameter, result parameter, next instruction pointer,
+        end of the code) tuples, where a parameter is ("fixed", position) or ("patched", address), or None if the
+        program cannot run in lockstep.
+        """
+        program = self.program
+        num_count = len(program)
+        if num_count < 3 or any(not -INT64_LIMIT <= value < INT64_LIMIT for value in program):
+            return None
+        # The same checks as the compiled programs.
+        if intcode_compiler.generate_source(program, self.patched) is None:
+            return None
+
+        instructions, code_end = intcode_compiler.decode(program, set(self.patched))
+        steps = []
+        for indx, opcode in instructions:
+            params = []
+            for param in (indx + 1, indx + 2, indx + 3):
+                if param in self.patched:
+                    params.append(("patched", param))
+                else:
+                    params.append(("fixed", program[param]))
+            steps.append((opcode, *params, indx + 4, code_end))
+        return steps
+    # end _plan()
+
+    def _run_interpreter(self, noun, verb):
+        try:
+            return self.vm.run(noun, verb)
+        except IndexError:
+            return None
+
+    def run_batch(self, nouns, verbs):
+        """
+        Run the program once for every noun/verb pair.
+
+        :param nouns: Values placed at address 1, one per run.
+        :param verbs: Values placed at address 2, one per run.
+        :return: A list of the values left at address 0, None for a run that went past the end of memory.
+        """
+        nouns = [int(noun) for noun in nouns]
+        verbs = [int(verb) for verb in verbs]
+        if len(nouns) != len(verbs):
+            raise ValueError("There must be as many nouns as verbs")
+
+        if self.steps is None or any(not -INT64_LIMIT <= value < INT64_LIMIT for value in nouns + verbs):
+            return [self._run_interpreter(noun, verb) for noun, verb in zip(nouns, verbs)]
+
+        count = len(nouns)
+        num_count = len(self.program)
+        rows = np.arange(count)
+        memory = np.empty((count, num_count), dtype=np.int64, order="F")
+        memory[:] = self.program
+        memory[:, 1] = nouns
+        memory[:, 2] = verbs
+        # Runs to redo in the interpreter.
+        fall_back = np.zeros(count, dtype=bool)
+
+        def positions(address, low, high):
+            # Positions read from a patched address, with the runs whose position is outside of [0, num_count) or in
+            # [low, high] marked to fall back. Those read from position 0 instead.
+            position = memory[:, address].copy()
+            outside = (position < 0) | (position >= num_count) | ((position >= low) & (position <= high))
+            fall_back[outside] = True
+            position[outside] = 0
+            return position
+
+        for opcode, first, second, result, next_indx, code_end in self.steps:
+            operands = []
+            for kind, value in (first, second):
+                if kind == "fixed":
+                    operands.append(memory[:, value])
+                else:
+                    operands.append(memory[rows, positions(value, 0, -1)])
+            left, right = operands
+
+            if opcode == 1:
+                total = left + right
+                # Adding two numbers of the same sign overflowed when the sign of the total differs.
+                fall_back |= ((left ^ total) & (right ^ total)) < 0
+            else:
+                total = left * right
+                # The product in floating point is close enough to tell which runs may have overflowed; a margin of
+                # a factor 2 covers its rounding.
+                fall_back |= np.abs(left.astype(np.float64) * right) >= INT64_LIMIT / 2
+
+            kind, value = result
+            if kind == "fixed":
+                memory[:, value] = total
+            else:
+                memory[rows, positions(value, next_indx, code_end)] = total
+
+        results = memory[:, 0].tolist()
+        for run in np.flatnonzero(fall_back).tolist():
+            results[run] = self._run_interpreter(nouns[run], verbs[run])
+        return results
+    # end run_batch()
+
+
+def find_noun_verb(program, target, nouns=range(100), verbs=range(100)):
+    """
+    Same search as question2.find_noun_verb(), running the whole grid of pairs as a single batch.
+
+    :param program: The Intcode program as a list of integers.
+    :param target: Value expected at address 0 after the program halts. For example: 19690720.
+    :param nouns: Values to try at address 1.
+    :param verbs: Values to try at address 2.
+    :return: The first (noun, verb) pair found in noun then verb order, or None if no pair produces the target.
+    """
+    pairs = [(noun, verb) for noun in nouns for verb in verbs]
+    results = BatchIntcodeVM(program).run_batch([noun for noun, _ in pairs], [verb for _, verb in pairs])
+
+    for pair, result in zip(pairs, results):
+        if result == target:
+            return pair
+    return None
+# end find_noun_verb()
+
+
+def main(program=None):
+    """
+    Compare the batch search with question2.find_noun_verb() on the puzzle input.
+
+    :param program: The Intcode program as an iterable of integers. Defaults to the puzzle input file.
+    """
+    if program is None:
+        program = intcode.load_program()
+    program = list(program)
+
+    start = time.perf_counter()
+    noun_verb = question2.find_noun_verb(intcode.IntcodeVM(program), 19690720)
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_noun_verb = find_noun_verb(program, 19690720)
+    batch_seconds = time.perf_counter() - start
+
+    if noun_verb != batch_noun_verb:
+        raise AssertionError(f"question2 found {noun_verb} but the batch found {batch_noun_verb}")
+    noun, verb = noun_verb or (-1, -1)
+    print(f"{100 * noun + verb}: interpreter {scalar_seconds:.3f}s, batch {batch_seconds:.3f}s "
+          f"({scalar_seconds / batch_seconds:.1f}x)")
+# end main()
+
+
+if __name__ == "__main__":
+    main()
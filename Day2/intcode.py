@@ -0,0 +1,208 @@
+"""
+Reusable Intcode computer shared by opcode.py and question2.py.
+
+The program is parsed once and kept as the initial memory state. Every run copies it back into the same preallocated
+memory list instead of building a new list. The add and multiply instructions are written out in the loop itself, with
+the operands read straight from memory, which is faster than calling the functions of the OPERATIONS table. Like the
+original loop, an unknown opcode is stepped over one position at a time.
+
+For example:
+    vm = IntcodeVM(parse_program("1,9,10,3,2,3,11,0,99,30,40,50"))
+    vm.run()          # 3500
+    vm.memory         # [3500, 9, 10, 70, 2, 3, 11, 0, 99, 30, 40, 50]
+
+To find out what a program spends its time on, give the computer an IntcodeProfiler. Runs then go through a separate
+instrumented loop that counts the instructions executed per opcode, keeps a sampled trace of the latest instructions
+in a ring buffer and times every run. Without a profiler the plain loop is used, so nothing is added to it:
+    vm.profiler = IntcodeProfiler(trace_size=100)
+    vm.run(12, 2)
+    vm.profiler.report()
+"""
+
+import operator
+import os
+import time
+from collections import deque
+
+import puzzle_input
+
+INPUT_FILE = os.path.join(os.path.dirname(__file__), "input.txt")
+
+HALT = 99
+
+# Opcode -> operation applied to the values at the first two parameter positions. The result is stored at the position
+# given by the third parameter.
+OPERATIONS = {
+    1: operator.add,
+    2: operator.mul,
+}
+
+
+def parse_program(program_text):
+    """
+    Remove the commas and convert the numbers of an Intcode program from string to integers.
+
+    :param program_text: Comma separated program. For example: "1,0,0,3,99".
+    :return: The program as a list of integers.
+    """
+    return list(map(int, program_text.split(",")))
+
+
+def load_program(source=None):
+    """
+    Read an Intcode program from a file or stream.
+
+    :param source: A file path, an open text file, or "-" for standard input. Defaults to the puzzle input file.
+    :return: The program as a list of integers.
+    """
+    return list(puzzle_input.iter_opcodes(INPUT_FILE if source is None else source))
+
+
+class IntcodeProfiler:
+    """
+    Statistics gathered by the instrumented loop of IntcodeVM.
+
+    :param trace_size: Number of latest sampled instructions kept in the trace.
+    :param sample_every: Only every sample_every-th instruction executed is added to the trace.
+    """
+
+    def __init__(self, trace_size=1000, sample_every=1):
+        self.sample_every = sample_every
+        # opcode -> number of times it was executed. Unknown opcodes stepped over are counted as well.
+        self.opcode_counts = {}
+        # (instruction number, instruction pointer, opcode, first parameter value, second parameter value,
+        # result position, result) of the sampled instructions.
+        self.trace = deque(maxlen=trace_size)
+        self.instructions = 0
+        self.runs = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_seconds = 0.0
+
+    def add_run(self, seconds):
+        self.runs += 1
+        self.total_seconds += seconds
+        self.last_seconds = seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def report(self):
+        """
+        :return: A dictionary summarising the runs profiled so far.
+        """
+        return {
+            "runs": self.runs,
+            "instructions": self.instructions,
+            "opcode_counts": dict(sorted(self.opcode_counts.items(), key=lambda item: -item[1])),
+            "total_seconds": self.total_seconds,
+            "mean_seconds": self.total_seconds / self.runs if self.runs else 0.0,
+            "max_seconds": self.max_seconds,
+            "last_seconds": self.last_seconds,
+            "trace": list(self.trace),
+        }
+    # end report()
+
+
+class IntcodeVM:
+    """
+    Intcode computer with memory that is reset to the original program before every run.
+
+    :param program: The Intcode program as a list of integers.
+    :param profiler: Optional IntcodeProfiler recording every run.
+    """
+
+    def __init__(self, program, profiler=None):
+        self.program = list(program)
+        self.memory = self.program[:]
+        self.profiler = profiler
+
+    def reset(self):
+        """
+        Restore the memory to the original program values without allocating a new list.
+        """
+        self.memory[:] = self.program
+
+    def execute(self):
+        """
+        Run the program on the current memory until it halts or the instruction pointer goes past the end of memory.
+
+        :return: The memory after the program has halted.
+        """
+        if self.profiler is not None:
+            return self._execute_instrumented(self.profiler)
+
+        memory = self.memory
+        num_count = len(memory)
+        indx = 0
+
+        # The opcodes of OPERATIONS are inlined here: 1 adds and 2 multiplies.
+        while indx < num_count:
+            opcode = memory[indx]
+            if opcode == 1:
+                memory[memory[indx + 3]] = memory[memory[indx + 1]] + memory[memory[indx + 2]]
+                indx += 4
+            elif opcode == 2:
+                memory[memory[indx + 3]] = memory[memory[indx + 1]] * memory[memory[indx + 2]]
+                indx += 4
+            elif opcode == 99:
+                break
+            else:
+                indx += 1
+
+        return memory
+    # end execute()
+
+    def _execute_instrumented(self, profiler):
+        """
+        Same as execute() while recording the opcode counts, the sampled trace and the run time in the profiler.
+        """
+        start = time.perf_counter()
+        memory = self.memory
+        num_count = len(memory)
+        operations = OPERATIONS
+        opcode_counts = profiler.opcode_counts
+        trace = profiler.trace
+        sample_every = profiler.sample_every
+        executed = profiler.instructions
+        indx = 0
+
+        while indx < num_count:
+            opcode = memory[indx]
+            executed += 1
+            opcode_counts[opcode] = opcode_counts.get(opcode, 0) + 1
+            if opcode == HALT:
+                break
+
+            operation = operations.get(opcode)
+            if operation is None:
+                indx += 1
+                continue
+
+            num1, num2 = memory[memory[indx + 1]], memory[memory[indx + 2]]
+            result_loc = memory[indx + 3]
+            memory[result_loc] = operation(num1, num2)
+            if executed % sample_every == 0:
+                trace.append((executed, indx, opcode, num1, num2, result_loc, memory[result_loc]))
+            indx += 4
+
+        profiler.instructions = executed
+        profiler.add_run(time.perf_counter() - start)
+        return memory
+    # end _execute_instrumented()
+
+    def run(self, noun=None, verb=None):
+        """
+        Reset the memory, place the noun at address 1 and the verb at address 2 and run the program. When the noun or
+        verb is None, the value from the program is used.
+
+        :param noun: Value placed at address 1.
+        :param verb: Value placed at address 2.
+        :return: The value left at address 0 after the program halts.
+        """
+        self.reset()
+        if noun is not None:
+            self.memory[1] = noun
+        if verb is not None:
+            self.memory[2] = verb
+
+        return self.execute()[0]
+    # end run()
@@ -0,0 +1,182 @@
+"""
+Compile add/multiply Intcode programs to Python functions.
+
+IntcodeVM decodes memory[indx] and reads the parameter positions again on every run. A program whose code is never
+overwritten while it runs only ever executes the same straight-line sequence of instructions, so it can be decoded once
+and turned into Python source that is compiled with compile(). For example, 1,9,10,3,2,3,11,0,99,30,40,50 becomes:
+    def run(m):
+        t0 = m[9] + m[10]
+        t1 = t0 * m[11]
+        m[3] = t0
+        m[0] = t1
+
+With no jumps the whole program is a single basic block, which is fused into one function:
+    * parameter positions are bound into the source as constants.
+    * values written by an instruction are kept in local variables and read back from there by the instructions that
+      follow. Only the last value written to each address is stored into memory, at the end of the block.
+
+The patched addresses (1 and 2, where the noun and verb go) are read from memory when the program runs, since their
+values change from run to run. An instruction whose parameter is a patched address uses the value found there as its
+position. Before such a read or write the pending values are stored, so memory is up to date.
+
+A program is not compiled if it writes into the code of an instruction it has yet to run, if a position it uses is
+outside of memory, or if a patched address holds an opcode. Writes to a position only known when the program runs are
+checked when they happen; if one would overwrite code still to be run, the run starts over in the interpreter. In both
+cases the results are the same as IntcodeVM's.
+"""
+
+from Day2 import intcode
+
+
+class SelfModifyingCode(Exception):
+    """
+    Raised by a compiled program about to write into its own code still to be run.
+    """
+
+
+def decode(program, patched):
+    """
+    Decode the program into the list of (instruction pointer, opcode) it runs, the same way IntcodeVM.execute() steps
+    through it when the code is not modified. Also gives the address of the halt instruction (or of the last cell when
+    there is none), which is the end of the code.
+
+    Returns None if a patched address is read as an opcode, as the instructions run then change from run to run.
+    """
+    instructions = []
+    num_count = len(program)
+    indx = 0
+
+    while indx < num_count:
+        if indx in patched:
+            return None
+        opcode = program[indx]
+        if opcode == intcode.HALT:
+            break
+        if opcode not in intcode.OPERATIONS:
+            indx += 1
+            continue
+        instructions.append((indx, opcode))
+        indx += 4
+
+    return instructions, min(indx, num_count - 1)
+# end decode()
+
+
+def generate_source(program, patched=(1, 2)):
+    """
+    Generate the Python source of the compiled program.
+
+    :param program: The Intcode program as a list of integers.
+    :param patched: Addresses whose values change between runs.
+    :return: The source of a function run(m) updating the memory list m in place, or None if the program cannot be
+    compiled.
+    """
+    num_count = len(program)
+    patched = set(patched)
+    decoded = decode(program, patched)
+    if decoded is None:
+        return None
+    instructions, code_end = decoded
+    symbols = {1: "+", 2: "*"}
+
+    lines = ["def run(m):"]
+    # address -> local variable holding the value last written there and not yet stored.
+    pending = {}
+    temp_count = 0
+
+    def flush():
+        for address, name in pending.items():
+            lines.append(f"    m[{address}] = {name}")
+        pending.clear()
+
+    for indx, opcode in instructions:
+        if indx + 3 >= num_count:
+            return None
+        next_indx = indx + 4
+
+        operands = []
+        for param in (indx + 1, indx + 2):
+            if param in patched:
+                flush()
+                operands.append(f"m[m[{param}]]")
+                continue
+            address = program[param]
+            if not 0 <= address < num_count:
+                return None
+            operands.append(pending.get(address, f"m[{address}]"))
+
+        name = f"t{temp_count}"
+        temp_count += 1
+        lines.append(f"    {name} = {operands[0]} {symbols[opcode]} {operands[1]}")
+
+        if indx + 3 in patched:
+            # The position written to is only known when the program runs.
+            flush()
+            lines.append(f"    a = m[{indx + 3}]")
+            lines.append(f"    if a < 0 or {next_indx} <= a <= {code_end}:")
+            lines.append("        raise SelfModifyingCode()")
+            lines.append(f"    m[a] = {name}")
+            continue
+
+        address = program[indx + 3]
+        if not 0 <= address < num_count or next_indx <= address <= code_end:
+            return None
+        pending[address] = name
+
+    flush()
+    lines.append("    return m")
+    return "\n".join(lines) + "\n"
+# end generate_source()
+
+
+def compile_program(program, patched=(1, 2)):
+    """
+    Compile the program to a Python function.
+
+    :param program: The Intcode program as a list of integers.
+    :param patched: Addresses whose values change between runs.
+    :return: A function run(m) updating the memory list m in place like IntcodeVM.execute(), or None if the program
+    cannot be compiled.
+    """
+    source = generate_source(program, patched)
+    if source is None:
+        return None
+
+    namespace = {"SelfModifyingCode": SelfModifyingCode}
+    exec(compile(source, "<intcode>", "exec"), namespace)
+    run = namespace["run"]
+    run.checks_writes = "SelfModifyingCode" in source
+    return run
+# end compile_program()
+
+
+class CompiledIntcodeVM(intcode.IntcodeVM):
+    """
+    IntcodeVM running the compiled program when there is one, and the interpreter otherwise. Runs with a profiler
+    always use the interpreter.
+
+    :param program: The Intcode program as a list of integers.
+    :param patched: Addresses whose values change between runs.
+    :param profiler: Optional intcode.IntcodeProfiler.
+    """
+
+    def __init__(self, program, patched=(1, 2), profiler=None):
+        super().__init__(program, profiler)
+        self.compiled = compile_program(self.program, patched)
+
+    def execute(self):
+        if self.compiled is None or self.profiler is not None:
+            return super().execute()
+
+        if not self.compiled.checks_writes:
+            return self.compiled(self.memory)
+
+        # Keep the starting memory to run the interpreter on if the program turns out to modify its code.
+        memory = self.memory
+        start_state = memory[:]
+        try:
+            return self.compiled(memory)
+        except SelfModifyingCode:
+            memory[:] = start_state
+            return super().execute()
+    # end execute()
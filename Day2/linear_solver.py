@@ -0,0 +1,109 @@
+"""
+Solve the noun/verb search of question2.py without trying every pair.
+
+A program made only of add and multiply instructions leaves a polynomial of the noun and verb at address 0, and for the
+gravity assist program that polynomial is linear:
+    output = base + noun_step * noun + verb_step * verb
+
+The coefficients are found by probing the program with a few noun/verb pairs. Extra probes check that the output really
+is affine in the noun and verb before the equation is solved for the target directly. The answer is then checked with
+one concrete run. If a probe does not fit the affine model, a probe fails to run, or no pair given by the equation is
+confirmed by a checking run, the brute force search from question2.py is used instead. Probes can fit a model that is
+wrong for the pairs not probed, so an equation without a solution in the ranges does not prove that there is no answer.
+"""
+
+from Day2 import intcode
+from Day2 import question2
+
+
+def probe_coefficients(vm, nouns, verbs):
+    """
+    Probe the program to find the coefficients of output = base + noun_step * (noun - n0) + verb_step * (verb - v0),
+    where n0 and v0 are the first noun and verb of the ranges.
+
+    :param vm: An intcode.IntcodeVM loaded with the program.
+    :param nouns: Range (or sequence) of at least two nouns.
+    :param verbs: Range (or sequence) of at least two verbs.
+    :return: (base, noun_step, verb_step), or None if the probed outputs are not affine in the noun and verb.
+    """
+    n0, n1, n_last = nouns[0], nouns[1], nouns[-1]
+    v0, v1, v_last = verbs[0], verbs[1], verbs[-1]
+
+    base = vm.run(n0, v0)
+    noun_step, noun_remainder = divmod(vm.run(n1, v0) - base, n1 - n0)
+    verb_step, verb_remainder = divmod(vm.run(n0, v1) - base, v1 - v0)
+    if noun_remainder or verb_remainder:
+        return None
+
+    def predict(n, v):
+        return base + noun_step * (n - n0) + verb_step * (v - v0)
+
+    # Any noun * verb, noun ** 2 or verb ** 2 terms would show up in these probes.
+    for n, v in ((n1, v1), (n_last, v0), (n0, v_last), (n_last, v_last)):
+        if vm.run(n, v) != predict(n, v):
+            return None
+
+    return base, noun_step, verb_step
+# end probe_coefficients()
+
+
+def solve_noun_verb(program, target, nouns=range(100), verbs=range(100)):
+    """
+    Find the noun and verb that make the program leave the target value at address 0.
+
+    :param program: The Intcode program as a list of integers.
+    :param target: Value expected at address 0 after the program halts. For example: 19690720.
+    :param nouns: Range (or sequence) of values to try at address 1.
+    :param verbs: Range (or sequence) of values to try at address 2.
+    :return: The first (noun, verb) pair in noun then verb order that produces the target, or None if there is none.
+    """
+    vm = intcode.IntcodeVM(program)
+    if len(nouns) < 2 or len(verbs) < 2:
+        return question2.find_noun_verb(vm, target, nouns, verbs)
+
+    try:
+        coefficients = probe_coefficients(vm, nouns, verbs)
+    except IndexError:
+        coefficients = None
+    if coefficients is None:
+        return question2.find_noun_verb(vm, target, nouns, verbs)
+
+    base, noun_step, verb_step = coefficients
+    n0, v0 = nouns[0], verbs[0]
+
+    for n in nouns:
+        remainder = target - base - noun_step * (n - n0)
+        if verb_step == 0:
+            if remainder != 0:
+                continue
+            v = v0
+        else:
+            v, left_over = divmod(remainder, verb_step)
+            v += v0
+            if left_over or v not in verbs:
+                continue
+
+        if vm.run(n, v) == target:
+            return n, v
+        # The program is not affine after all.
+        break
+
+    return question2.find_noun_verb(vm, target, nouns, verbs)
+# end solve_noun_verb()
+
+
+def main(program=None):
+    """
+    :param program: The Intcode program as an iterable of integers. Defaults to the puzzle input file.
+    """
+    if program is None:
+        program = intcode.load_program()
+
+    noun, verb = solve_noun_verb(program, 19690720) or (-1, -1)
+
+    print(100 * noun + verb)
+# end main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Parallel version of the noun/verb search done in question2.py.
+
+The noun range is split into chunks of consecutive nouns and every chunk is searched with all the verbs by a worker in a
+process pool. Each worker builds its own IntcodeVM once, so a run only costs the memory reset and the program itself.
+
+Once a chunk finds the target, the chunks after it are cancelled and workers already running one of them stop at their
+next noun. Chunks before it are still searched to the end, so the pair returned is the same one the nested for loops in
+question2.py would find first.
+
+For example:
+    program = intcode.load_program()
+    noun, verb = find_noun_verb(program, 19690720)
+    print(100 * noun + verb)
+"""
+
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from Day2 import intcode
+
+# Per worker process state set up by _init_worker().
+_vm = None
+_stop_after = None
+
+
+def _init_worker(program, stop_after):
+    global _vm, _stop_after
+    _vm = intcode.IntcodeVM(program)
+    _stop_after = stop_after
+
+
+def _search_chunk(chunk_index, nouns, verbs, target):
+    """
+    Try every noun of the chunk with every verb in order and return the first pair that produces the target. Returns
+    None if no pair in the chunk does or if an earlier chunk has already found the target.
+    """
+    for n in nouns:
+        if _stop_after.value < chunk_index:
+            return None
+        for v in verbs:
+            if _vm.run(n, v) == target:
+                return n, v
+    return None
+# end _search_chunk()
+
+
+def find_noun_verb(program, target, nouns=range(100), verbs=range(100), workers=None, chunk_size=None):
+    """
+    Find the noun and verb that make the program leave the target value at address 0.
+
+    :param program: The Intcode program as a list of integers.
+    :param target: Value expected at address 0 after the program halts. For example: 19690720.
+    :param nouns: Range (or sequence) of values to try at address 1.
+    :param verbs: Range (or sequence) of values to try at address 2.
+    :param workers: Number of worker processes. Defaults to the number of CPUs.
+    :param chunk_size: Number of nouns searched by a worker at a time. Defaults to about four chunks per worker.
+    :return: The (noun, verb) pair found first in noun then verb order, or None if no pair produces the target.
+    """
+    workers = workers or multiprocessing.cpu_count()
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(len(nouns) / (workers * 4)))
+
+    chunks = [nouns[i:i + chunk_size] for i in range(0, len(nouns), chunk_size)]
+    if not chunks:
+        return None
+
+    # Index of the earliest chunk that found the target. Only written by this process, workers just read it.
+    context = multiprocessing.get_context()
+    stop_after = context.RawValue("q", len(chunks))
+
+    results = [None] * len(chunks)
+    finished = [False] * len(chunks)
+    errors = {}
+    next_pending = 0
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                             initargs=(list(program), stop_after)) as executor:
+        futures = {executor.submit(_search_chunk, i, chunk, verbs, target): i for i, chunk in enumerate(chunks)}
+
+        for future in as_completed(futures):
+            i = futures[future]
+            finished[i] = True
+            if future.cancelled():
+                continue
+
+            try:
+                results[i] = future.result()
+            except Exception as error:
+                errors[i] = error
+
+            if results[i] is not None and i < stop_after.value:
+                stop_after.value = i
+                for other, j in futures.items():
+                    if j > i:
+                        other.cancel()
+
+            # Done once every chunk before (and including) the earliest hit has been searched.
+            while next_pending < len(chunks) and finished[next_pending]:
+                if next_pending in errors:
+                    raise errors[next_pending]
+                if results[next_pending] is not None:
+                    return results[next_pending]
+                next_pending += 1
+
+    return None
+# end find_noun_verb()
@@ -55,38 +55,21 @@ replace position 1 with the value 12 and replace position 2 with the value 2. Wh
 the program halts?
 """
 
-opcodes_input_original = "1,0,0,3,1,1,2,3,1,3,4,3,1,5,0,3,2,6,1,19,1,5,19,23,2,9,23,27,1,6,27,31,1,31,9,35,2,35,10,39,1,5,39,43,2,43,9,47,1,5,47,51,1,51,5,55,1,55,9,59,2,59,13,63,1,63,9,67,1,9,67,71,2,71,10,75,1,75,6,79,2,10,79,83,1,5,83,87,2,87,10,91,1,91,5,95,1,6,95,99,2,99,13,103,1,103,6,107,1,107,5,111,2,6,111,115,1,115,13,119,1,119,2,123,1,5,123,0,99,2,0,14,0"
+from Day2 import intcode
 
-# Modify the input to contain 12 at index 1 and 2 at index 2.
-opcodes_input_modified = "1,12,2,3,1,1,2,3,1,3,4,3,1,5,0,3,2,6,1,19,1,5,19,23,2,9,23,27,1,6,27,31,1,31,9,35,2,35,10,39,1,5,39,43,2,43,9,47,1,5,47,51,1,51,5,55,1,55,9,59,2,59,13,63,1,63,9,67,1,9,67,71,2,71,10,75,1,75,6,79,2,10,79,83,1,5,83,87,2,87,10,91,1,91,5,95,1,6,95,99,2,99,13,103,1,103,6,107,1,107,5,111,2,6,111,115,1,115,13,119,1,119,2,123,1,5,123,0,99,2,0,14,0"
 
-# Remove the commas and convert the numbers from string to integers.
-opcodes = list(map(int, opcodes_input_modified.split(",")))
-numCount = len(opcodes)
-indx = 0
+def main(program=None):
+    """
+    :param program: The Intcode program as an iterable of integers. Defaults to the puzzle input file.
+    """
+    if program is None:
+        program = intcode.load_program()
 
-while indx < numCount and opcodes[indx] != 99:
-    if opcodes[indx] == 1:
-        # Add two numbers residing at the locations given by the next two indices: opcodes[indx+1], opcodes[indx+2].
-        # Then, store the result at the 3rd index given. That would be opcodes[index+3].
-        num1_loc, num2_loc = opcodes[indx+1], opcodes[indx+2]
-        result_loc = opcodes[indx+3]
-        opcodes[result_loc] = opcodes[num1_loc] + opcodes[num2_loc]
-        indx += 4
-        #print(f"\t{opcodes[num1_loc]} + {opcodes[num2_loc]} = {opcodes[result_loc]}\tindex={indx}")
-        continue
-
-    if opcodes[indx] == 2:
-        # Same process as operation code 1 (addition). This time though, multiply two numbers and store the result.
-        num1_loc, num2_loc = opcodes[indx+1], opcodes[indx+2]
-        result_loc = opcodes[indx+3]
-        opcodes[result_loc] = opcodes[num1_loc] * opcodes[num2_loc]
-        #print(f"\t{opcodes[num1_loc]} * {opcodes[num2_loc]} = {opcodes[result_loc]}\tindex={indx}")
-        indx += 4
-        continue
-
-    indx += 1
-
-print(opcodes[0])
+    # Modify the input to contain 12 at index 1 and 2 at index 2 when running the program.
+    vm = intcode.IntcodeVM(program)
+    print(vm.run(12, 2))
+# end main()
 
 
+if __name__ == "__main__":
+    main()
@@ -27,53 +27,49 @@ Find the input noun and verb that cause the program to produce the output 196907
 example, if noun=12 and verb=2, the answer would be 1202.)
 """
 
-opcodes_input_original = "1,0,0,3,1,1,2,3,1,3,4,3,1,5,0,3,2,6,1,19,1,5,19,23,2,9,23,27,1,6,27,31,1,31,9,35,2,35,10,39,1,5,39,43,2,43,9,47,1,5,47,51,1,51,5,55,1,55,9,59,2,59,13,63,1,63,9,67,1,9,67,71,2,71,10,75,1,75,6,79,2,10,79,83,1,5,83,87,2,87,10,91,1,91,5,95,1,6,95,99,2,99,13,103,1,103,6,107,1,107,5,111,2,6,111,115,1,115,13,119,1,119,2,123,1,5,123,0,99,2,0,14,0"
-
-# Modify the input to contain 12 at index 1 and 2 at index 2.
-# opcodes_input_modified = "1,12,2,3,1,1,2,3,1,3,4,3,1,5,0,3,2,6,1,19,1,5,19,23,2,9,23,27,1,6,27,31,1,31,9,35,2,35,10,39,1,5,39,43,2,43,9,47,1,5,47,51,1,51,5,55,1,55,9,59,2,59,13,63,1,63,9,67,1,9,67,71,2,71,10,75,1,75,6,79,2,10,79,83,1,5,83,87,2,87,10,91,1,91,5,95,1,6,95,99,2,99,13,103,1,103,6,107,1,107,5,111,2,6,111,115,1,115,13,119,1,119,2,123,1,5,123,0,99,2,0,14,0"
-
-# Remove the commas and convert the numbers from string to integers.
-opcodes_original = list(map(int, opcodes_input_original.split(",")))
-numCount = len(opcodes_original)
-noun_verb_found = False
-noun, verb = -1, -1
-
-# for n in range(99, -1, -1):
-for n in range(100):
-    if noun_verb_found:
-        break
-
-    for v in range(100):
-        # Reset input to original values
-        opcodes = opcodes_original[:]
-        opcodes[1] = n
-        opcodes[2] = v
-        indx = 0
-
-        while indx < numCount and opcodes[indx] != 99:
-            if opcodes[indx] == 1:
-                num1_loc, num2_loc = opcodes[indx + 1], opcodes[indx + 2]
-                result_loc = opcodes[indx + 3]
-                opcodes[result_loc] = opcodes[num1_loc] + opcodes[num2_loc]
-                indx += 4
-                continue
-
-            if opcodes[indx] == 2:
-                num1_loc, num2_loc = opcodes[indx + 1], opcodes[indx + 2]
-                result_loc = opcodes[indx + 3]
-                opcodes[result_loc] = opcodes[num1_loc] * opcodes[num2_loc]
-                indx += 4
-                continue
-
-            indx += 1
-        # end while loop
-
-        if opcodes[0] == 19690720:
-            noun, verb = n, v
-            noun_verb_found = True
-            break
-    # end for v loop
-# end for n loop
-
-print(100 * noun + verb)
+from Day2 import intcode
+from Day2 import intcode_compiler
 
+
+def find_noun_verb(vm, target, nouns=range(100), verbs=range(100), cache=None):
+    """
+    Brute force search for the noun and verb that make the program leave the target value at address 0.
+
+    :param vm: An intcode.IntcodeVM loaded with the program.
+    :param target: Value expected at address 0 after the program halts. For example: 19690720.
+    :param nouns: Values to try at address 1.
+    :param verbs: Values to try at address 2.
+    :param cache: Optional run_cache.RunCache looked up before running the program.
+    :return: The first (noun, verb) pair found in noun then verb order, or None if no pair produces the target.
+    """
+    run = vm.run if cache is None else cache.runner(vm)
+
+    # for n in range(99, -1, -1):
+    for n in nouns:
+        for v in verbs:
+            # Each run resets the memory to the original values before placing the noun and verb.
+            if run(n, v) == target:
+                return n, v
+        # end for v loop
+    # end for n loop
+
+    return None
+# end find_noun_verb()
+
+
+def main(program=None):
+    """
+    :param program: The Intcode program as an iterable of integers. Defaults to the puzzle input file.
+    """
+    if program is None:
+        program = intcode.load_program()
+
+    vm = intcode_compiler.CompiledIntcodeVM(program)
+    noun, verb = find_noun_verb(vm, 19690720) or (-1, -1)
+
+    print(100 * noun + verb)
+# end main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Cache of Intcode run results keyed by the program and the values patched into it.
+
+The same program is often searched again with the same noun/verb pairs. RunCache remembers the value left at address 0
+for each (program hash, patched addresses) key:
+    * in memory, in a least recently used cache holding at most maxsize results.
+    * optionally on disk, in an SQLite database that survives restarts. Results missing from memory are looked up there
+      before the program is run.
+
+For example:
+    with RunCache(path="intcode_runs.sqlite") as cache:
+        noun, verb = question2.find_noun_verb(vm, 19690720, cache=cache)
+"""
+
+import hashlib
+import sqlite3
+from collections import OrderedDict
+
+# Number of new results written to disk before they are committed.
+COMMIT_EVERY = 1000
+
+
+def program_hash(program):
+    """
+    :param program: The Intcode program as a list of integers.
+    :return: A hex digest identifying the program.
+    """
+    return hashlib.sha256(",".join(map(str, program)).encode("ascii")).hexdigest()
+
+
+class RunCache:
+    """
+    Two tier cache of Intcode run results.
+
+    :param maxsize: Number of results kept in memory.
+    :param path: Optional path of an SQLite database used as a second, persistent tier.
+    """
+
+    def __init__(self, maxsize=65536, path=None):
+        self.maxsize = maxsize
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.db = None
+        self.pending_writes = 0
+
+        if path is not None:
+            self.db = sqlite3.connect(path)
+            self.db.execute("CREATE TABLE IF NOT EXISTS runs "
+                            "(program TEXT, patches TEXT, result TEXT, PRIMARY KEY (program, patches))")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Commit the pending results to disk and close the database.
+        """
+        if self.db is not None:
+            self.db.commit()
+            self.db.close()
+            self.db = None
+
+    def _remember(self, key, result):
+        self.memory[key] = result
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+
+    def get(self, program_key, patches):
+        """
+        :param program_key: Hash of the program as returned by program_hash().
+        :param patches: Tuple of (address, value) pairs patched into the program before the run.
+        :return: The cached result, or None if the run is not cached.
+        """
+        key = (program_key, patches)
+        result = self.memory.get(key)
+        if result is not None:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return result
+
+        if self.db is not None:
+            row = self.db.execute("SELECT result FROM runs WHERE program = ? AND patches = ?",
+                                  (program_key, repr(patches))).fetchone()
+            if row is not None:
+                result = int(row[0])
+                self._remember(key, result)
+                self.hits += 1
+                return result
+
+        self.misses += 1
+        return None
+    # end get()
+
+    def put(self, program_key, patches, result):
+        """
+        Store the result of a run in memory and, if there is one, in the database.
+        """
+        self._remember((program_key, patches), result)
+
+        if self.db is not None:
+            self.db.execute("INSERT OR REPLACE INTO runs VALUES (?, ?, ?)", (program_key, repr(patches), str(result)))
+            self.pending_writes += 1
+            if self.pending_writes >= COMMIT_EVERY:
+                self.db.commit()
+                self.pending_writes = 0
+    # end put()
+
+    def runner(self, vm):
+        """
+        Wrap IntcodeVM.run() so that runs are looked up in the cache first.
+
+        :param vm: An intcode.IntcodeVM loaded with the program.
+        :return: A function taking the noun and verb like vm.run().
+        """
+        program_key = program_hash(vm.program)
+
+        def run(noun=None, verb=None):
+            patches = ((1, noun), (2, verb))
+            result = self.get(program_key, patches)
+            if result is None:
+                result = vm.run(noun, verb)
+                self.put(program_key, patches, result)
+            return result
+
+        return run
+    # end runner()
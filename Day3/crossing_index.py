@@ -0,0 +1,165 @@
+"""
+Repeated queries over the crossings of two wires.
+
+closest_to_central.main() and best_from_central.main() go through every crossing to find the smallest distance or
+number of steps, and would have to do so again for every other question asked about the same wires. CrossingIndex is
+built once from the build_graph() lists of the two wires and keeps:
+    * the crossings sorted by Manhattan distance and by combined steps, so the k closest or k cheapest crossings are
+      the first k of a list.
+    * a grid of square buckets, each holding the crossings that fall in it. A bounding box query only looks at the
+      buckets the box overlaps, and only checks the crossings of the buckets on the edge of the box.
+
+The steps to a crossing are counted as in best_from_central.py: the number of cells a wire entered when it first got
+there.
+
+For example:
+    index = CrossingIndex(closest_to_central.build_graph(["R8", "U5", "L5", "D3"]),
+                          closest_to_central.build_graph(["U7", "R6", "D4", "L4"]))
+    index.closest(2)                    # [(6, (3, 3)), (11, (6, 5))]
+    index.cheapest(1)                   # [(30, (6, 5))]
+    index.in_box(0, 0, 4, 4)            # [(3, 3)]
+"""
+
+import math
+from bisect import bisect_right
+
+import puzzle_input
+from Day3 import closest_to_central
+
+
+def _first_steps(coordinates):
+    """
+    Map every cell of a build_graph() list to the steps taken when first reaching it.
+    """
+    steps = {}
+    for indx, point in enumerate(coordinates, 1):
+        if point:
+            steps.setdefault(point, indx)
+    return steps
+
+
+class CrossingIndex:
+    """
+    Index of the crossings of two wires.
+
+    :param coordinates1: Cells of the first wire as returned by closest_to_central.build_graph().
+    :param coordinates2: Cells of the second wire.
+    :param bucket_size: Width of the grid buckets. By default it is chosen so that there is about one crossing per
+    bucket over the area covered by the crossings.
+    """
+
+    def __init__(self, coordinates1, coordinates2, bucket_size=None):
+        steps1 = _first_steps(coordinates1)
+        steps2 = _first_steps(coordinates2)
+        # point -> (steps of the first wire, steps of the second wire)
+        self.steps = {point: (steps1[point], steps2[point]) for point in steps1.keys() & steps2.keys()}
+
+        self.by_distance = sorted((abs(x) + abs(y), (x, y)) for x, y in self.steps)
+        self.by_steps = sorted((sum(steps), point) for point, steps in self.steps.items())
+        self._distances = [distance for distance, _ in self.by_distance]
+
+        if bucket_size is None:
+            bucket_size = 1
+            if self.steps:
+                width = max(x for x, _ in self.steps) - min(x for x, _ in self.steps) + 1
+                height = max(y for _, y in self.steps) - min(y for _, y in self.steps) + 1
+                bucket_size = max(1, math.isqrt(width * height // len(self.steps)))
+        self.bucket_size = bucket_size
+
+        # (bucket column, bucket row) -> crossings in the bucket
+        self.buckets = {}
+        for x, y in self.steps:
+            self.buckets.setdefault((x // bucket_size, y // bucket_size), []).append((x, y))
+
+    def __len__(self):
+        return len(self.steps)
+
+    def closest(self, k=1):
+        """
+        The k crossings closest to the central port.
+
+        :return: A list of (Manhattan distance, cell), closest first. Ties are ordered by cell.
+        """
+        return self.by_distance[:k]
+
+    def cheapest(self, k=1):
+        """
+        The k crossings with the fewest combined steps.
+
+        :return: A list of (combined steps, cell), cheapest first. Ties are ordered by cell.
+        """
+        return self.by_steps[:k]
+
+    def within_distance(self, distance):
+        """
+        :return: The crossings at most the given Manhattan distance away from the central port, as (distance, cell)
+        tuples, closest first.
+        """
+        return self.by_distance[:bisect_right(self._distances, distance)]
+
+    def in_box(self, min_x, min_y, max_x, max_y):
+        """
+        The crossings inside a bounding box, edges included.
+
+        :return: A sorted list of the cells.
+        """
+        size = self.bucket_size
+        first_column, last_column = min_x // size, max_x // size
+        first_row, last_row = min_y // size, max_y // size
+        found = []
+
+        # Go through the buckets of the box, or through the buckets holding crossings when there are fewer of those.
+        if (last_column - first_column + 1) * (last_row - first_row + 1) <= len(self.buckets):
+            keys = ((column, row) for column in range(first_column, last_column + 1)
+                    for row in range(first_row, last_row + 1))
+        else:
+            keys = (key for key in self.buckets
+                    if first_column <= key[0] <= last_column and first_row <= key[1] <= last_row)
+
+        for column, row in keys:
+            bucket = self.buckets.get((column, row))
+            if bucket is None:
+                continue
+            if first_column < column < last_column and first_row < row < last_row:
+                # The bucket is inside the box.
+                found.extend(bucket)
+            else:
+                found.extend((x, y) for x, y in bucket if min_x <= x <= max_x and min_y <= y <= max_y)
+
+        found.sort()
+        return found
+    # end in_box()
+
+    def closest_distance(self):
+        """
+        Same answer as closest_to_central.main(), or None when the wires never cross.
+        """
+        return self.by_distance[0][0] if self.by_distance else None
+
+    def fewest_combined_steps(self):
+        """
+        Same answer as best_from_central.main(), or None when the wires never cross.
+        """
+        return self.by_steps[0][0] if self.by_steps else None
+
+
+def main(wires=None):
+    """
+    Print the answers of closest_to_central.main() and best_from_central.main() from a single index.
+
+    :param wires: Iterable of two wires, each an iterable of codes. Defaults to streaming them from the puzzle input
+    file.
+    """
+    if wires is None:
+        wires = puzzle_input.iter_wires(closest_to_central.INPUT_FILE)
+    wires = iter(wires)
+
+    index = CrossingIndex(closest_to_central.build_graph(next(wires)), closest_to_central.build_graph(next(wires)))
+
+    print(index.closest_distance())
+    print(index.fewest_combined_steps())
+# end main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Wires that can be changed a few moves at a time without rebuilding them.
+
+IncrementalWire keeps the cells of a wire in path order, split by move, along with the first-visit steps and the number
+of visits of every cell. Appending a move only walks the new move. Truncating only walks the moves removed: a cell whose
+first visit is removed is never visited by the moves left, so the first-visit steps of the other cells stay the same.
+Editing a move truncates the wire back to it and appends the edited move and the moves after it, as all of them are
+moved along.
+
+WirePair keeps the set of crossings of two such wires up to date as cells are added to and removed from either wire.
+The closest crossing and the one with the fewest combined steps are kept in heaps, so both queries can be answered
+after every edit without looking at the whole paths.
+
+For example:
+    pair = WirePair(["R8", "U5", "L5", "D3"], ["U7", "R6", "D4", "L4"])
+    pair.closest_distance()             # 6
+    pair.wires[1].edit(3, "L2")
+    pair.closest_distance()             # 11
+"""
+
+import heapq
+
+from Day3 import closest_to_central
+
+
+class IncrementalWire:
+    """
+    A wire whose moves can be appended, truncated and edited.
+
+    :param graph_codes: Initial codes of the wire. For example: ["R8", "U5", "L5", "D3"].
+    :param on_add: Optional function called with a cell when the wire first reaches it.
+    :param on_remove: Optional function called with a cell when the wire no longer reaches it.
+    """
+
+    def __init__(self, graph_codes=(), on_add=None, on_remove=None):
+        self.codes = []
+        # Cells in the order the wire enters them, as in closest_to_central.build_graph().
+        self.cells = []
+        # Number of cells after each move, and the x,y position reached by each move.
+        self.move_ends = []
+        self.positions = []
+        # cell -> steps taken when first reaching the cell, and cell -> number of visits.
+        self.first_steps = {}
+        self.visits = {}
+        self.on_add = on_add
+        self.on_remove = on_remove
+
+        for code in graph_codes:
+            self.append(code)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def append(self, code):
+        """
+        Add a move at the end of the wire.
+        """
+        x, y = self.positions[-1] if self.positions else (0, 0)
+        x, y, line_coords = closest_to_central.process_graph_code(x, y, code)
+
+        for point in line_coords:
+            self.cells.append(point)
+            if point in self.visits:
+                self.visits[point] += 1
+                continue
+            self.visits[point] = 1
+            self.first_steps[point] = len(self.cells)
+            if self.on_add is not None:
+                self.on_add(point)
+
+        self.codes.append(code)
+        self.move_ends.append(len(self.cells))
+        self.positions.append((x, y))
+    # end append()
+
+    def truncate(self, n_moves):
+        """
+        Remove the moves after the first n_moves.
+        """
+        while len(self.codes) > n_moves:
+            start = self.move_ends[-2] if len(self.move_ends) > 1 else 0
+
+            for point in reversed(self.cells[start:]):
+                self.visits[point] -= 1
+                if self.visits[point]:
+                    continue
+                del self.visits[point]
+                del self.first_steps[point]
+                if self.on_remove is not None:
+                    self.on_remove(point)
+
+            del self.cells[start:]
+            self.codes.pop()
+            self.move_ends.pop()
+            self.positions.pop()
+    # end truncate()
+
+    def edit(self, index, code):
+        """
+        Replace the move at the given index. The moves after it are kept and follow on from the edited move.
+        A negative index counts from the last move, as for a list, and an index out of range raises IndexError.
+        """
+        if not -len(self.codes) <= index < len(self.codes):
+            raise IndexError("move index out of range")
+        if index < 0:
+            index += len(self.codes)
+
+        following = self.codes[index + 1:]
+        self.truncate(index)
+        self.append(code)
+        for next_code in following:
+            self.append(next_code)
+    # end edit()
+
+
+class WirePair:
+    """
+    Two incremental wires and their crossings.
+
+    :param graph1_codes: Initial codes of the first wire.
+    :param graph2_codes: Initial codes of the second wire.
+    """
+
+    def __init__(self, graph1_codes=(), graph2_codes=()):
+        self.crossings = set()
+        # Heaps of (distance, cell) and (combined steps, cell). Entries of cells that are no longer crossings, or whose
+        # combined steps changed, are dropped when they reach the top.
+        self._by_distance = []
+        self._by_steps = []
+
+        self.wires = (
+            IncrementalWire(on_add=lambda point: self._cell_added(0, point), on_remove=self._cell_removed),
+            IncrementalWire(on_add=lambda point: self._cell_added(1, point), on_remove=self._cell_removed),
+        )
+        for code in graph1_codes:
+            self.wires[0].append(code)
+        for code in graph2_codes:
+            self.wires[1].append(code)
+
+    def _cell_added(self, wire, point):
+        if point not in self.wires[1 - wire].first_steps:
+            return
+        self.crossings.add(point)
+        heapq.heappush(self._by_distance, (abs(point[0]) + abs(point[1]), point))
+        heapq.heappush(self._by_steps, (self.combined_steps(point), point))
+
+    def _cell_removed(self, point):
+        self.crossings.discard(point)
+        # Rebuild the heaps once they hold mostly stale entries.
+        if len(self._by_distance) > 2 * len(self.crossings) + 64:
+            self._by_distance = [(abs(p[0]) + abs(p[1]), p) for p in self.crossings]
+            self._by_steps = [(self.combined_steps(p), p) for p in self.crossings]
+            heapq.heapify(self._by_distance)
+            heapq.heapify(self._by_steps)
+
+    def combined_steps(self, point):
+        """
+        Sum of both wires' first-visit steps to a crossing.
+        """
+        return self.wires[0].first_steps[point] + self.wires[1].first_steps[point]
+
+    def closest_distance(self):
+        """
+        Same answer as closest_to_central.main() for the current wires, or None when they never cross.
+        """
+        heap = self._by_distance
+        while heap:
+            distance, point = heap[0]
+            if point in self.crossings:
+                return distance
+            heapq.heappop(heap)
+        return None
+    # end closest_distance()
+
+    def fewest_combined_steps(self):
+        """
+        Same answer as best_from_central.main() for the current wires, or None when they never cross.
+        """
+        heap = self._by_steps
+        while heap:
+            steps, point = heap[0]
+            if point in self.crossings and steps == self.combined_steps(point):
+                return steps
+            heapq.heappop(heap)
+        return None
+    # end fewest_combined_steps()
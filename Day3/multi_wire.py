@@ -0,0 +1,140 @@
+"""
+Intersection queries over any number of wires.
+
+closest_to_central.main() and best_from_central.main() only compare two wires. WireIndex walks each wire once and keeps
+one shared index of every cell visited: a bitmask of the wires that visit the cell, and the first-visit step count of
+each wire (as in best_from_central.build_step_index()). Cells visited by two or more wires are also tracked separately,
+so the queries only look at crossings and never at the rest of the paths.
+
+Wires are numbered in the order they are added. Every query takes the subset of wires to look at (all of them by
+default) and the number k of those wires that must cross at a cell. For example, with the two wires from the puzzle:
+    index = WireIndex([["R8", "U5", "L5", "D3"], ["U7", "R6", "D4", "L4"]])
+    index.closest_distance()            # 6
+    index.fewest_combined_steps()       # 30
+"""
+
+from Day3 import closest_to_central
+
+
+class WireIndex:
+    """
+    Shared index of the cells visited by a set of wires.
+
+    :param wires: Optional iterable of wires to add, each an iterable of codes like "R8".
+    """
+
+    def __init__(self, wires=()):
+        # cell -> bitmask of the wires visiting it.
+        self.masks = {}
+        # One dictionary per wire: cell -> steps taken by the wire when it first reaches the cell.
+        self.steps = []
+        # Cells visited by at least two wires.
+        self.shared = set()
+
+        for graph_codes in wires:
+            self.add_wire(graph_codes)
+
+    def add_wire(self, graph_codes):
+        """
+        Walk a new wire once and add its cells to the index.
+
+        :param graph_codes: A list of directions and number of steps to take. For example: ["R8", "U5", "L5", "D3"].
+        :return: The number given to the wire.
+        """
+        wire = len(self.steps)
+        bit = 1 << wire
+        masks = self.masks
+        shared = self.shared
+        step_index = {}
+        x, y = 0, 0
+        steps = 0
+
+        for code in graph_codes:
+            x, y, line_coords = closest_to_central.process_graph_code(x, y, code)
+            for point in line_coords:
+                steps += 1
+                if point in step_index:
+                    continue
+                step_index[point] = steps
+
+                mask = masks.get(point, 0)
+                if mask:
+                    shared.add(point)
+                masks[point] = mask | bit
+
+        self.steps.append(step_index)
+        return wire
+    # end add_wire()
+
+    def _subset_mask(self, wires):
+        if wires is None:
+            return (1 << len(self.steps)) - 1
+        mask = 0
+        for wire in wires:
+            if not 0 <= wire < len(self.steps):
+                raise ValueError(f"Unknown wire {wire}")
+            mask |= 1 << wire
+        return mask
+
+    def crossings(self, wires=None, k=2):
+        """
+        Cells where at least k of the given wires cross.
+
+        :param wires: Numbers of the wires to look at. Defaults to all the wires.
+        :param k: Number of those wires that must visit a cell, at least 2.
+        :return: A generator of (cell, bitmask of the given wires visiting the cell).
+        """
+        if k < 2:
+            raise ValueError("A crossing needs at least 2 wires")
+        subset = self._subset_mask(wires)
+
+        for point in self.shared:
+            mask = self.masks[point] & subset
+            if mask.bit_count() >= k:
+                yield point, mask
+    # end crossings()
+
+    def combined_steps(self, point, mask):
+        """
+        Sum of the first-visit steps to the cell of every wire in the bitmask.
+        """
+        total = 0
+        wire = 0
+        while mask:
+            if mask & 1:
+                total += self.steps[wire][point]
+            mask >>= 1
+            wire += 1
+        return total
+
+    def closest_crossing(self, wires=None, k=2):
+        """
+        Crossing of at least k of the given wires closest to the central port, by Manhattan distance.
+
+        :return: (distance, cell), or None when there is no such crossing.
+        """
+        return min(((abs(point[0]) + abs(point[1]), point) for point, _ in self.crossings(wires, k)), default=None)
+
+    def cheapest_crossing(self, wires=None, k=2):
+        """
+        Crossing of at least k of the given wires with the fewest combined steps. The steps of every given wire that
+        visits the cell are added up.
+
+        :return: (combined steps, cell), or None when there is no such crossing.
+        """
+        return min(((self.combined_steps(point, mask), point) for point, mask in self.crossings(wires, k)),
+                   default=None)
+
+    def closest_distance(self, wires=None, k=2):
+        """
+        Same answer as closest_to_central.main() for the given wires, or None when they never cross.
+        """
+        closest = self.closest_crossing(wires, k)
+        return None if closest is None else closest[0]
+
+    def fewest_combined_steps(self, wires=None, k=2):
+        """
+        Same answer as best_from_central.main() for the given wires, or None when they never cross.
+        """
+        cheapest = self.cheapest_crossing(wires, k)
+        return None if cheapest is None else cheapest[0]
@@ -0,0 +1,164 @@
+"""
+Compact storage for the grid cells of a wire.
+
+build_graph() stores every cell as an x-y tuple in a list, which takes over 100 bytes per cell before the sets used to
+intersect the wires are even built. Here every cell is packed into a single 64-bit integer key:
+    key = x * 2**32 + (y + 2**31)
+and the keys of a wire are kept in an array('q') (or a NumPy int64 array when NumPy is installed) at 8 bytes per cell.
+The keys of a line are added straight from a range, so no temporary lists or tuples are built either.
+
+With NumPy, the wires are intersected with np.intersect1d() on the sorted key arrays. Without it, the keys of each wire
+are sorted SORT_CHUNK at a time into a second array('q'), the sorted runs are merged as they are read, and the two
+sorted streams are walked together. Only a chunk of the keys is ever held as Python integers, so no set or list of
+the whole wire is built.
+
+Like build_graph(), the central port is not part of a wire and a cell is listed every time the wire enters it. Codes
+with an unknown direction add no cells (build_graph() adds an empty tuple for them). x and y must fit in 32-bit
+integers.
+"""
+
+import heapq
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import puzzle_input
+from Day3 import closest_to_central
+
+Y_OFFSET = 1 << 31
+X_STEP = 1 << 32
+
+# Keys sorted at a time when NumPy is not installed.
+SORT_CHUNK = 1 << 16
+
+# Key step for one move in each direction.
+KEY_STEPS = {"R": X_STEP, "L": -X_STEP, "U": 1, "D": -1}
+MOVES = {"R": (1, 0), "L": (-1, 0), "U": (0, 1), "D": (0, -1)}
+
+
+def pack(x, y):
+    """
+    Pack the x,y cell into a single integer key.
+    """
+    return x * X_STEP + y + Y_OFFSET
+
+
+def unpack(key):
+    """
+    Get back the x,y cell from its integer key.
+    """
+    return key >> 32, (key & 0xFFFFFFFF) - Y_OFFSET
+
+
+def build_packed_graph(graph_codes):
+    """
+    Same as closest_to_central.build_graph() but giving the packed keys of the cells.
+
+    :param graph_codes: A list of directions and number of steps to take. For example: ["R8", "U5", "L5", "D3"].
+    :return: An array('q') of the cell keys in the order the wire enters them.
+    """
+    graph = array("q")
+    x, y = 0, 0
+
+    for code in graph_codes:
+        direction = code[:1]
+        n_units = int(code[1:])
+        if direction not in MOVES:
+            continue
+
+        step = KEY_STEPS[direction]
+        start = pack(x, y) + step
+        graph.extend(range(start, start + n_units * step, step))
+
+        dx, dy = MOVES[direction]
+        x += dx * n_units
+        y += dy * n_units
+
+    return graph
+# end build_packed_graph()
+
+
+def iter_sorted_keys(keys):
+    """
+    Iterate over the keys of a wire in increasing order, without NumPy.
+
+    :param keys: Keys of a wire as returned by build_packed_graph().
+    :return: An iterator over the keys, repeated keys included.
+    """
+    runs = array("q")
+    for start in range(0, len(keys), SORT_CHUNK):
+        runs.extend(sorted(keys[start:start + SORT_CHUNK]))
+
+    # Slices of a memoryview share the memory of the array, so the runs are not copied again.
+    view = memoryview(runs)
+    return heapq.merge(*(view[start:start + SORT_CHUNK] for start in range(0, len(runs), SORT_CHUNK)))
+# end iter_sorted_keys()
+
+
+def intersect_keys(keys1, keys2):
+    """
+    Keys found in both wires.
+
+    :param keys1: Keys of the first wire as returned by build_packed_graph().
+    :param keys2: Keys of the second wire.
+    :return: The shared keys in increasing order, as a NumPy array, or an array('q') when NumPy is not installed.
+    """
+    if np is not None:
+        return np.intersect1d(np.frombuffer(keys1, dtype=np.int64), np.frombuffer(keys2, dtype=np.int64))
+
+    shared = array("q")
+    keys2 = iter_sorted_keys(keys2)
+    key2 = next(keys2, None)
+    for key1 in iter_sorted_keys(keys1):
+        while key2 is not None and key2 < key1:
+            key2 = next(keys2, None)
+        if key2 is None:
+            break
+        if key2 == key1 and (not shared or shared[-1] != key1):
+            shared.append(key1)
+    return shared
+# end intersect_keys()
+
+
+def closest_distance(keys1, keys2):
+    """
+    Manhattan distance from the central port to the closest intersection of the two wires.
+
+    :return: The smallest distance, or None when the wires never cross.
+    """
+    intersections = intersect_keys(keys1, keys2)
+    if not len(intersections):
+        return None
+
+    if np is not None:
+        x = intersections >> 32
+        y = (intersections & 0xFFFFFFFF) - Y_OFFSET
+        return int((np.abs(x) + np.abs(y)).min())
+
+    return min(abs(x) + abs(y) for x, y in map(unpack, intersections))
+# end closest_distance()
+
+
+def main(wires=None):
+    """
+    Same as closest_to_central.main() using the packed cell keys.
+
+    :param wires: Iterable of two wires, each an iterable of codes. Defaults to streaming them from the puzzle input
+    file.
+    """
+    if wires is None:
+        wires = puzzle_input.iter_wires(closest_to_central.INPUT_FILE)
+    wires = iter(wires)
+
+    keys1 = build_packed_graph(next(wires))
+    keys2 = build_packed_graph(next(wires))
+
+    print(closest_distance(keys1, keys2))
+# end main()
+
+
+if __name__ == "__main__":
+    main()
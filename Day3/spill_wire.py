@@ -0,0 +1,298 @@
+"""
+Out-of-core intersection of wires too long to keep in memory.
+
+build_graph() and build_step_index() keep every cell of a wire in memory. SpilledWire walks the wire once and writes the
+packed keys of its cells (see packed_coordinates.py) to a temporary file instead:
+    * the cells are collected in a buffer of run_size cells. When the buffer is full it is sorted by key, only the first
+      visit of each key is kept, and the (key, first-visit steps) pairs are written to the file as a sorted run.
+    * when there are more than fan_in runs, groups of fan_in runs are merged into single longer runs, written to a new
+      file. This is repeated until at most fan_in runs are left.
+
+The file is memory-mapped and its runs are read back a block at a time and merged with heapq.merge(), which gives every
+cell of the wire once, in key order, with the steps of its first visit. merge_join() walks the merged cells of two wires
+side by side and gives the cells both wires visit.
+
+Memory use is bounded by run_size, fan_in and the read block size, whatever the length of the wires. The answers are
+the same as closest_to_central.main() and best_from_central.main(); as in those, the central port only counts when a
+wire comes back to it. As in packed_coordinates.py, codes with an unknown direction add no cells.
+
+For example:
+    with SpilledWire(codes1) as wire1, SpilledWire(codes2) as wire2:
+        distance, steps = crossing_answers(wire1, wire2)
+"""
+
+import heapq
+import mmap
+import tempfile
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import puzzle_input
+from Day3 import closest_to_central
+from Day3 import packed_coordinates
+
+# Cells sorted in memory at a time, runs merged at a time, and pairs read from a run at a time.
+RUN_SIZE = 1 << 18
+FAN_IN = 64
+READ_BLOCK = 1 << 12
+
+# Bytes taken by one (key, steps) pair.
+PAIR_SIZE = 2 * array("q").itemsize
+
+
+def _first_visits(keys, first_step):
+    """
+    Sort a buffer of keys and keep the first visit of each.
+
+    :param keys: array('q') of keys in the order the wire enters them.
+    :param first_step: Steps taken to reach the first key of the buffer.
+    :return: array('q') of interleaved key, steps pairs sorted by key.
+    """
+    if np is not None:
+        key_array = np.frombuffer(keys, dtype=np.int64)
+        # A stable sort keeps the visits of a key in path order, so the first one has the fewest steps.
+        order = np.argsort(key_array, kind="stable")
+        sorted_keys = key_array[order]
+        first = np.ones(len(sorted_keys), dtype=bool)
+        first[1:] = sorted_keys[1:] != sorted_keys[:-1]
+
+        pairs = np.empty((int(first.sum()), 2), dtype=np.int64)
+        pairs[:, 0] = sorted_keys[first]
+        pairs[:, 1] = order[first] + first_step
+        return array("q", pairs.tobytes())
+
+    pairs = array("q")
+    last_key = None
+    for indx in sorted(range(len(keys)), key=keys.__getitem__):
+        key = keys[indx]
+        if key != last_key:
+            pairs.append(key)
+            pairs.append(indx + first_step)
+            last_key = key
+    return pairs
+# end _first_visits()
+
+
+def _merge_first_visits(runs):
+    """
+    Merge sorted iterables of (key, steps) pairs, keeping the fewest steps of each key.
+    """
+    last_key = None
+    for key, steps in heapq.merge(*runs):
+        if key != last_key:
+            yield key, steps
+            last_key = key
+# end _merge_first_visits()
+
+
+class SpilledWire:
+    """
+    The cells of a wire and their first-visit steps, kept on disk as sorted runs.
+
+    :param graph_codes: An iterable of codes like "R8". Only read once, so it can be streamed.
+    :param run_size: Number of cells sorted in memory at a time.
+    :param fan_in: Most runs merged at a time.
+    :param directory: Directory of the temporary files. Defaults to the system temporary directory.
+    """
+
+    def __init__(self, graph_codes, run_size=RUN_SIZE, fan_in=FAN_IN, directory=None):
+        if fan_in < 2:
+            raise ValueError("fan_in must be at least 2")
+        self.run_size = run_size
+        self.fan_in = fan_in
+        self.directory = directory
+        self.file = None
+        self.map = None
+        # (first pair, end pair) of every sorted run in the file.
+        self.runs = []
+        self.cells = 0
+
+        self._spill(graph_codes)
+        while len(self.runs) > fan_in:
+            self._merge_pass()
+        self._map()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Close and delete the temporary file.
+        """
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def _write_run(self, pairs):
+        start = self.file.tell() // PAIR_SIZE
+        pairs.tofile(self.file)
+        self.runs.append((start, start + len(pairs) // 2))
+
+    def _spill(self, graph_codes):
+        """
+        Walk the wire and write its cells to the file as sorted runs of first visits.
+        """
+        self.file = tempfile.TemporaryFile(dir=self.directory)
+        buffer = array("q")
+        x, y = 0, 0
+
+        for code in graph_codes:
+            direction = code[:1]
+            n_units = int(code[1:])
+            if direction not in packed_coordinates.MOVES:
+                continue
+
+            step = packed_coordinates.KEY_STEPS[direction]
+            start = packed_coordinates.pack(x, y) + step
+            keys = range(start, start + n_units * step, step)
+            while keys:
+                space = self.run_size - len(buffer)
+                buffer.extend(keys[:space])
+                keys = keys[space:]
+                if len(buffer) == self.run_size:
+                    self._write_run(_first_visits(buffer, self.cells + 1))
+                    self.cells += len(buffer)
+                    del buffer[:]
+
+            dx, dy = packed_coordinates.MOVES[direction]
+            x += dx * n_units
+            y += dy * n_units
+
+        if buffer:
+            self._write_run(_first_visits(buffer, self.cells + 1))
+            self.cells += len(buffer)
+    # end _spill()
+
+    def _merge_pass(self):
+        """
+        Merge the runs fan_in at a time into a new file.
+        """
+        self._map()
+        old_file, old_map, old_runs = self.file, self.map, self.runs
+        self.file = tempfile.TemporaryFile(dir=self.directory)
+        self.map = None
+        self.runs = []
+
+        for group in range(0, len(old_runs), self.fan_in):
+            runs = [self._read_run(old_map, start, end) for start, end in old_runs[group:group + self.fan_in]]
+            start = self.file.tell() // PAIR_SIZE
+            buffer = array("q")
+            for key, steps in _merge_first_visits(runs):
+                buffer.append(key)
+                buffer.append(steps)
+                if len(buffer) >= 2 * READ_BLOCK:
+                    buffer.tofile(self.file)
+                    del buffer[:]
+            buffer.tofile(self.file)
+            self.runs.append((start, self.file.tell() // PAIR_SIZE))
+
+        old_map.close()
+        old_file.close()
+    # end _merge_pass()
+
+    def _map(self):
+        self.file.flush()
+        if self.file.tell():
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def _read_run(file_map, start, end):
+        """
+        Generator of the (key, steps) pairs of a run, read from the mapped file a block at a time.
+        """
+        for block in range(start, end, READ_BLOCK):
+            values = array("q")
+            values.frombytes(file_map[block * PAIR_SIZE:min(block + READ_BLOCK, end) * PAIR_SIZE])
+            pairs = iter(values.tolist())
+            yield from zip(pairs, pairs)
+    # end _read_run()
+
+    def __iter__(self):
+        """
+        Every cell visited by the wire once, in key order, as (key, steps taken when first reaching the cell).
+        """
+        if self.map is None:
+            return iter(())
+        return _merge_first_visits(self._read_run(self.map, start, end) for start, end in self.runs)
+# end class SpilledWire
+
+
+def merge_join(wire1, wire2):
+    """
+    Cells visited by both wires.
+
+    :param wire1: Sorted (key, steps) pairs of the first wire, for example a SpilledWire.
+    :param wire2: Sorted (key, steps) pairs of the second wire.
+    :return: A generator of (key, steps of the first wire, steps of the second wire) in key order.
+    """
+    cells2 = iter(wire2)
+    key2, steps2 = next(cells2, (None, None))
+    if key2 is None:
+        return
+
+    for key1, steps1 in wire1:
+        while key2 < key1:
+            key2, steps2 = next(cells2, (None, None))
+            if key2 is None:
+                return
+        if key2 == key1:
+            yield key1, steps1, steps2
+# end merge_join()
+
+
+def crossing_answers(wire1, wire2):
+    """
+    Answer both parts of the puzzle in one pass over the crossings of the two wires.
+
+    :return: (Manhattan distance of the closest crossing, fewest combined steps to a crossing), or (None, None) when
+    the wires never cross.
+    """
+    closest = None
+    fewest = None
+
+    for key, steps1, steps2 in merge_join(wire1, wire2):
+        x, y = packed_coordinates.unpack(key)
+        distance = abs(x) + abs(y)
+        if closest is None or distance < closest:
+            closest = distance
+        if fewest is None or steps1 + steps2 < fewest:
+            fewest = steps1 + steps2
+
+    return closest, fewest
+# end crossing_answers()
+
+
+def main(wires=None, run_size=RUN_SIZE, directory=None):
+    """
+    Print the answers of closest_to_central.main() and best_from_central.main(), spilling the wires to disk.
+
+    :param wires: Iterable of two wires, each an iterable of codes. Defaults to streaming them from the puzzle input
+    file.
+    :param run_size: Number of cells sorted in memory at a time.
+    :param directory: Directory of the temporary files.
+    """
+    if wires is None:
+        wires = puzzle_input.iter_wires(closest_to_central.INPUT_FILE)
+    wires = iter(wires)
+
+    with SpilledWire(next(wires), run_size, directory=directory) as wire1, \
+            SpilledWire(next(wires), run_size, directory=directory) as wire2:
+        closest, fewest = crossing_answers(wire1, wire2)
+
+    print(closest)
+    print(fewest)
+# end main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Segment based alternative to closest_to_central.build_graph.
+
+build_graph expands every code such as "R999" into one tuple per grid cell, so the memory and time needed to find the
+intersections grow with the total length of the wires. Here each wire is kept as a list of axis-aligned segments, one
+per code, and the crossings are found with a sweep-line over the segments. The work then grows with the number of codes
+and crossings rather than with the path length.
+
+A segment is the tuple (x1, y1, x2, y2, steps) where (x1, y1) is the first grid cell the wire enters for the code,
+(x2, y2) is the last one and steps is the number of steps the wire has taken when it enters (x1, y1). Just like
+create_line_coordinates, the starting point of a code is not part of its segment as it belongs to the previous one.
+For example, ["R8", "U5"] becomes:
+    [(1, 0, 8, 0, 1), (8, 1, 8, 5, 9)]
+"""
+
+from bisect import bisect_left, insort
+
+
+def build_segments(graph_codes):
+    """
+    Build the list of segments for a wire given its list of codes. Codes with an unknown direction or no steps do not
+    add any grid cells to the wire, so they are skipped.
+
+    :param graph_codes: A list of directions and number of steps to take. For example: ["R8", "U5", "L5", "D3"].
+    :return: A list of (x1, y1, x2, y2, steps) segments, one for each code that moves the wire.
+    """
+    segments = []
+    x, y = 0, 0
+    steps = 0
+
+    for code in graph_codes:
+        direction = code[:1]
+        n_units = int(code[1:])
+        if n_units <= 0:
+            continue
+
+        if direction == "R":
+            segments.append((x + 1, y, x + n_units, y, steps + 1))
+            x += n_units
+        elif direction == "L":
+            segments.append((x - 1, y, x - n_units, y, steps + 1))
+            x -= n_units
+        elif direction == "U":
+            segments.append((x, y + 1, x, y + n_units, steps + 1))
+            y += n_units
+        elif direction == "D":
+            segments.append((x, y - 1, x, y - n_units, steps + 1))
+            y -= n_units
+        else:
+            continue
+        steps += n_units
+
+    return segments
+# end build_segments()
+
+
+def steps_to_cell(segment, x, y):
+    """
+    Number of steps the wire has taken when it reaches the x,y cell lying on the given segment.
+
+    :param segment: A (x1, y1, x2, y2, steps) segment.
+    :param x: x position of a cell on the segment.
+    :param y: y position of a cell on the segment.
+    :return: Number of steps from the central port to the cell along the wire.
+    """
+    return segment[4] + abs(x - segment[0]) + abs(y - segment[1])
+
+
+def _split_segments(segments):
+    """
+    Split segments into horizontal and vertical ones. Each is given as (fixed, low, high, segment) where fixed is the
+    shared y (or x) value and low, high are the inclusive x (or y) range covered. A single cell segment is only put in
+    the horizontal list as that is enough to find all of its crossings.
+    """
+    horizontals = []
+    verticals = []
+
+    for segment in segments:
+        x1, y1, x2, y2 = segment[:4]
+        if y1 == y2:
+            horizontals.append((y1, min(x1, x2), max(x1, x2), segment))
+        else:
+            verticals.append((x1, min(y1, y2), max(y1, y2), segment))
+
+    return horizontals, verticals
+# end _split_segments()
+
+
+def _perpendicular_crossings(horizontals, verticals):
+    """
+    Sweep a vertical line from left to right over the grid. Horizontal segments are kept in a sorted active list while
+    the sweep line is over them, and every vertical segment looks up the active horizontals within its y range.
+
+    :return: A generator of (x, y, horizontal segment, vertical segment) for every crossing found.
+    """
+    # Event kinds are ordered so that a horizontal segment is active while the vertical segments on its end points are
+    # looked at.
+    add, query, remove = 0, 1, 2
+    events = []
+    for idx, (y, x_low, x_high, _) in enumerate(horizontals):
+        events.append((x_low, add, idx))
+        events.append((x_high, remove, idx))
+    for idx, (x, _, _, _) in enumerate(verticals):
+        events.append((x, query, idx))
+    events.sort()
+
+    active = []
+    for x, kind, idx in events:
+        if kind == add:
+            insort(active, (horizontals[idx][0], idx))
+        elif kind == remove:
+            del active[bisect_left(active, (horizontals[idx][0], idx))]
+        else:
+            _, y_low, y_high, vertical = verticals[idx]
+            pos = bisect_left(active, (y_low, -1))
+            while pos < len(active) and active[pos][0] <= y_high:
+                y, h_idx = active[pos]
+                yield x, y, horizontals[h_idx][3], vertical
+                pos += 1
+# end _perpendicular_crossings()
+
+
+def _collinear_overlaps(lines1, lines2):
+    """
+    Find the ranges where segments of the two wires run on top of each other along the same row (or column).
+
+    :return: A generator of (fixed, low, high, segment1, segment2) for every overlapping pair of segments.
+    """
+    by_fixed = {}
+    for line in lines2:
+        by_fixed.setdefault(line[0], []).append(line)
+    for others in by_fixed.values():
+        others.sort(key=lambda line: line[1])
+
+    for fixed, low1, high1, segment1 in lines1:
+        for _, low2, high2, segment2 in by_fixed.get(fixed, ()):
+            if low2 > high1:
+                break
+            low, high = max(low1, low2), min(high1, high2)
+            if low <= high:
+                yield fixed, low, high, segment1, segment2
+# end _collinear_overlaps()
+
+
+def iter_crossings(segments1, segments2):
+    """
+    Find every run of grid cells shared by the two wires. Wires crossing at a right angle share a single cell, while
+    wires running on top of each other share a straight run of cells.
+
+    :param segments1: Segments of the first wire as returned by build_segments().
+    :param segments2: Segments of the second wire as returned by build_segments().
+    :return: A generator of ((x_start, y_start), (x_end, y_end), segment1, segment2) where the first two items are the
+    end cells of the shared run and segment1, segment2 the segments of each wire the run lies on.
+    """
+    horizontals1, verticals1 = _split_segments(segments1)
+    horizontals2, verticals2 = _split_segments(segments2)
+
+    for x, y, segment1, segment2 in _perpendicular_crossings(horizontals1, verticals2):
+        yield (x, y), (x, y), segment1, segment2
+    for x, y, segment2, segment1 in _perpendicular_crossings(horizontals2, verticals1):
+        yield (x, y), (x, y), segment1, segment2
+
+    for y, x_low, x_high, segment1, segment2 in _collinear_overlaps(horizontals1, horizontals2):
+        yield (x_low, y), (x_high, y), segment1, segment2
+    for x, y_low, y_high, segment1, segment2 in _collinear_overlaps(verticals1, verticals2):
+        yield (x, y_low), (x, y_high), segment1, segment2
+# end iter_crossings()
+
+
+def closest_distance(graph1_codes, graph2_codes):
+    """
+    Manhattan distance from the central port to the closest intersection of the two wires. Gives the same answer as
+    closest_to_central.main() for the same wires.
+
+    :param graph1_codes: A list of codes for the first wire. For example: ["R8", "U5", "L5", "D3"].
+    :param graph2_codes: A list of codes for the second wire.
+    :return: The smallest distance, or None when the wires never cross.
+    """
+    distances = []
+    for (x1, y1), (x2, y2), _, _ in iter_crossings(build_segments(graph1_codes), build_segments(graph2_codes)):
+        # The cell of a run closest to the central port is the one nearest to 0 along the run.
+        x = min(max(0, min(x1, x2)), max(x1, x2))
+        y = min(max(0, min(y1, y2)), max(y1, y2))
+        distances.append(abs(x) + abs(y))
+
+    return min(distances, default=None)
+# end closest_distance()
+
+
+def fewest_combined_steps(graph1_codes, graph2_codes):
+    """
+    Fewest combined steps the two wires take to reach an intersection. Any later visit of a cell takes more steps than
+    the first, so the smallest sum over all the crossings found is the same as using the first visits only.
+
+    :param graph1_codes: A list of codes for the first wire. For example: ["R8", "U5", "L5", "D3"].
+    :param graph2_codes: A list of codes for the second wire.
+    :return: The fewest combined steps, or None when the wires never cross.
+    """
+    combined_steps = []
+    for start, end, segment1, segment2 in iter_crossings(build_segments(graph1_codes), build_segments(graph2_codes)):
+        # The step sum changes linearly along a run, so its smallest value is found at one of the run's ends.
+        for x, y in (start, end):
+            combined_steps.append(steps_to_cell(segment1, x, y) + steps_to_cell(segment2, x, y))
+
+    return min(combined_steps, default=None)
+# end fewest_combined_steps()
@@ -0,0 +1,122 @@
+"""
+NumPy batch version of is_password_valid() from password_checker.py and password_checker2.py.
+
+Instead of checking one integer at a time, a whole range of passwords is turned into a matrix with one row per password
+and one column per digit. Each rule is then checked for all the rows at once:
+    * the digits never decrease: every difference between adjacent digits is >= 0.
+    * two adjacent digits are the same: some difference between adjacent digits is 0.
+    * a group of exactly two (password_checker2.py): an adjacent pair whose neighbouring pairs are not equal.
+
+NumPy is optional for the rest of the repository and only needed by this module. Running it compares the results and
+timings against the scalar is_password_valid() functions.
+"""
+
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from Day4 import password_checker
+from Day4 import password_checker2
+
+NDIGITS = 6
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("The batch validator needs NumPy. Install it with: pip install numpy")
+
+
+def password_mask(minimum_value, maximum_value, group_of_2_only=False):
+    """
+    Check every password from minimum_value to maximum_value (inclusive).
+
+    :param minimum_value: First password of the range.
+    :param maximum_value: Last password of the range.
+    :param group_of_2_only: False to use the rules of password_checker.py, True for the rules of password_checker2.py.
+    :return: A boolean array where item i tells if minimum_value + i is a valid password.
+    """
+    _require_numpy()
+
+    passwords = np.arange(minimum_value, maximum_value + 1, dtype=np.int64)
+    if passwords.size == 0:
+        return np.zeros(0, dtype=bool)
+
+    # One column per digit, most significant digit first.
+    powers = 10 ** np.arange(NDIGITS - 1, -1, -1, dtype=np.int64)
+    digits = (passwords[:, None] // powers) % 10
+    steps = np.diff(digits, axis=1)
+
+    mask = (passwords >= 10 ** (NDIGITS - 1)) & (passwords < 10 ** NDIGITS)
+    mask &= np.all(steps >= 0, axis=1)
+
+    pairs = steps == 0
+    if group_of_2_only:
+        # A pair is a group of exactly two when the pairs on either side of it are not pairs as well.
+        padded = np.pad(pairs, ((0, 0), (1, 1)))
+        pairs = pairs & ~padded[:, :-2] & ~padded[:, 2:]
+    mask &= np.any(pairs, axis=1)
+
+    return mask
+# end password_mask()
+
+
+def count_valid_passwords(minimum_value, maximum_value, group_of_2_only=False, chunk_size=1_000_000):
+    """
+    Count the valid passwords from minimum_value to maximum_value (inclusive). The range is checked chunk_size
+    passwords at a time to keep the digit matrix small.
+
+    :param minimum_value: First password of the range.
+    :param maximum_value: Last password of the range.
+    :param group_of_2_only: False to use the rules of password_checker.py, True for the rules of password_checker2.py.
+    :param chunk_size: Number of passwords checked at a time.
+    :return: The number of valid passwords.
+    """
+    total = 0
+    for start in range(minimum_value, maximum_value + 1, chunk_size):
+        end = min(start + chunk_size - 1, maximum_value)
+        total += int(np.count_nonzero(password_mask(start, end, group_of_2_only)))
+    return total
+# end count_valid_passwords()
+
+
+def benchmark(minimum_value, maximum_value):
+    """
+    Time the scalar is_password_valid() loops against the batch version for both rule sets and check they agree.
+
+    :return: A list of (name, count, scalar seconds, batch seconds) tuples.
+    """
+    results = []
+
+    for name, module, group_of_2_only in (("password_checker", password_checker, False),
+                                          ("password_checker2", password_checker2, True)):
+        start = time.perf_counter()
+        scalar_count = sum(1 for pswd in range(minimum_value, maximum_value + 1)
+                           if module.is_password_valid(pswd, minimum_value, maximum_value))
+        scalar_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch_count = count_valid_passwords(minimum_value, maximum_value, group_of_2_only)
+        batch_seconds = time.perf_counter() - start
+
+        if scalar_count != batch_count:
+            raise AssertionError(f"{name}: scalar count {scalar_count} != batch count {batch_count}")
+        results.append((name, batch_count, scalar_seconds, batch_seconds))
+
+    return results
+# end benchmark()
+
+
+def main():
+    minval, maxval = password_checker.puzzle_range()
+
+    for name, count, scalar_seconds, batch_seconds in benchmark(minval, maxval):
+        print(f"{name}: {count} valid passwords, scalar {scalar_seconds:.3f}s, batch {batch_seconds:.3f}s "
+              f"({scalar_seconds / batch_seconds:.1f}x)")
+# end main()
+
+
+if __name__ == "__main__":
+    main()
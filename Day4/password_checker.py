@@ -15,6 +15,12 @@ How many different passwords within the range given in your puzzle input meet th
 Your puzzle input is 109165-576723.
 """
 
+import os
+
+import puzzle_input
+
+INPUT_FILE = os.path.join(os.path.dirname(__file__), "input.txt")
+
 def is_password_valid(password, minimum_value, maximum_value):
     if not isinstance(password, int):
         #print("\tnot an integer")
@@ -51,9 +57,28 @@ def is_password_valid(password, minimum_value, maximum_value):
 # end is_password_valid()
 
 
-def main():
-    minval = 109165
-    maxval = 576723
+def puzzle_range(minval=None, maxval=None):
+    """
+    Fill in the bounds of the password range that are not given with those of the puzzle input file.
+
+    :param minval: Smallest password allowed, or None.
+    :param maxval: Largest password allowed, or None.
+    :return: (minimum value, maximum value).
+    """
+    if minval is None or maxval is None:
+        input_minval, input_maxval = puzzle_input.read_range(INPUT_FILE)
+        minval = input_minval if minval is None else minval
+        maxval = input_maxval if maxval is None else maxval
+    return minval, maxval
+# end puzzle_range()
+
+
+def main(minval=None, maxval=None):
+    """
+    :param minval: Smallest password allowed. Defaults to the range of the puzzle input file.
+    :param maxval: Largest password allowed. Defaults to the range of the puzzle input file.
+    """
+    minval, maxval = puzzle_range(minval, maxval)
     valid_pswds = []
 
     for pswd in range(minval, maxval + 1):
@@ -24,6 +24,8 @@ How many different passwords within the range given in your puzzle input meet th
 Your puzzle input is 109165-576723.
 """
 
+from Day4 import password_checker
+
 
 def is_password_valid(password, minimum_value, maximum_value):
     if not isinstance(password, int):
@@ -67,9 +69,12 @@ def is_password_valid(password, minimum_value, maximum_value):
 # end is_password_valid()
 
 
-def main():
-    minval = 109165
-    maxval = 576723
+def main(minval=None, maxval=None):
+    """
+    :param minval: Smallest password allowed. Defaults to the range of the puzzle input file.
+    :param maxval: Largest password allowed. Defaults to the range of the puzzle input file.
+    """
+    minval, maxval = password_checker.puzzle_range(minval, maxval)
     valid_pswds = []
 
     for pswd in range(minval, maxval + 1):
@@ -0,0 +1,136 @@
+"""
+Count valid passwords without checking every integer in the range.
+
+Going from left to right, the digits of a valid password never decrease, so a password is fully described by how many
+of each digit it holds. There are only 5005 such 6-digit sequences (293930 for 12 digits) against the 467559 integers
+from 109165 to 576723 checked by password_checker.main() and password_checker2.main().
+
+Two ways are given here:
+    * non_decreasing_passwords() yields only the passwords with non-decreasing digits within the range, so any rule can
+      be checked on them with count_valid_passwords().
+    * count_passwords() counts the valid passwords digit by digit (a digit DP) without building any of them.
+
+Rules take the password digits as a string. has_adjacent_pair() is the rule from password_checker.py and
+has_group_of_2() is the rule from password_checker2.py.
+"""
+
+from functools import lru_cache
+from itertools import combinations_with_replacement
+
+from Day4 import password_checker
+
+DIGITS = "0123456789"
+
+
+def has_adjacent_pair(password_digits):
+    """
+    Two adjacent digits are the same (like 22 in 122345).
+    """
+    return any(password_digits[idx] == password_digits[idx - 1] for idx in range(1, len(password_digits)))
+
+
+def has_group_of_2(password_digits):
+    """
+    There is a group of exactly two adjacent matching digits (like 22 in 111122). As the digits never decrease, all
+    copies of a digit are adjacent and the group size is the digit count.
+    """
+    return any(password_digits.count(d) == 2 for d in set(password_digits))
+
+
+def non_decreasing_passwords(minimum_value, maximum_value, ndigits=6):
+    """
+    Generate, in increasing order, the ndigits long passwords within the range whose digits never decrease.
+
+    :param minimum_value: Smallest password allowed.
+    :param maximum_value: Largest password allowed.
+    :param ndigits: Number of digits in a password.
+    :return: A generator of (password, password_digits) tuples.
+    """
+    for digits in combinations_with_replacement(DIGITS, ndigits):
+        if digits[0] == "0":
+            continue
+        password_digits = "".join(digits)
+        password = int(password_digits)
+        if password > maximum_value:
+            break
+        if password >= minimum_value:
+            yield password, password_digits
+# end non_decreasing_passwords()
+
+
+def count_valid_passwords(minimum_value, maximum_value, rule=has_adjacent_pair, ndigits=6):
+    """
+    Count the passwords with non-decreasing digits within the range that also meet the given rule.
+
+    :param minimum_value: Smallest password allowed.
+    :param maximum_value: Largest password allowed.
+    :param rule: Function given the password digits as a string that returns True for a valid password.
+    :param ndigits: Number of digits in a password.
+    :return: The number of valid passwords.
+    """
+    return sum(1 for _, password_digits in non_decreasing_passwords(minimum_value, maximum_value, ndigits)
+               if rule(password_digits))
+
+
+def _count_up_to(limit, ndigits, group_of_2_only):
+    """
+    Count the zero padded ndigits long sequences not above limit with non-decreasing digits and a pair of digits.
+    """
+    if limit < 0:
+        return 0
+    limit_digits = str(min(limit, 10 ** ndigits - 1)).zfill(ndigits)
+
+    def group_qualifies(run):
+        return run == 2 if group_of_2_only else run >= 2
+
+    @lru_cache(maxsize=None)
+    def walk(pos, previous, run, found, tight):
+        # previous is the last digit placed, run is how many times in a row it was placed (counted up to 3, which is
+        # enough for both rules) and found tells if a qualifying group was already closed.
+        if pos == ndigits:
+            return 1 if found or group_qualifies(run) else 0
+
+        top = int(limit_digits[pos]) if tight else 9
+        total = 0
+        for d in range(previous, top + 1):
+            if d == previous and pos > 0:
+                next_run, next_found = min(run + 1, 3), found
+            else:
+                next_run, next_found = 1, found or group_qualifies(run)
+            total += walk(pos + 1, d, next_run, next_found, tight and d == top)
+        return total
+
+    return walk(0, 0, 0, False, True)
+# end _count_up_to()
+
+
+def count_passwords(minimum_value, maximum_value, ndigits=6, group_of_2_only=False):
+    """
+    Count the valid passwords in the range without generating them.
+
+    :param minimum_value: Smallest password allowed.
+    :param maximum_value: Largest password allowed.
+    :param ndigits: Number of digits in a password.
+    :param group_of_2_only: False to use the rules of password_checker.py, True for the rules of password_checker2.py.
+    :return: The number of valid passwords.
+    """
+    minimum_value = max(minimum_value, 10 ** (ndigits - 1))
+    maximum_value = min(maximum_value, 10 ** ndigits - 1)
+    if minimum_value > maximum_value:
+        return 0
+
+    return (_count_up_to(maximum_value, ndigits, group_of_2_only)
+            - _count_up_to(minimum_value - 1, ndigits, group_of_2_only))
+# end count_passwords()
+
+
+def main():
+    minval, maxval = password_checker.puzzle_range()
+
+    print(f"{count_valid_passwords(minval, maxval, has_adjacent_pair)} valid passwords")
+    print(f"{count_valid_passwords(minval, maxval, has_group_of_2)} valid passwords with a group of 2")
+# end main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Precomputed index of the valid passwords, for counting the passwords of many ranges.
+
+password_checker.main() and password_checker2.main() check every integer of the range again for every range asked.
+There are only a few thousand valid 6-digit passwords under each rule set, so they can be listed once, in increasing
+order, and written to a file as packed 32-bit unsigned integers (array('I'), in the byte order of the machine):
+    build_index(path, group_of_2_only) lists them with password_counter.non_decreasing_passwords().
+    PasswordIndex(path) memory-maps the file and uses it in place as a sequence of integers, without reading or copying
+    it. The passwords of a range are found with two bisections, so counting them does not depend on the size of the
+    range.
+
+For example:
+    with open_index() as index:
+        index.count(109165, 576723)         # 2814
+        index.passwords_in(111110, 111199)  # [111111, 111112, ...]
+"""
+
+import mmap
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+
+from Day4 import password_checker
+from Day4 import password_counter
+
+INDEX_FILES = {
+    False: os.path.join(os.path.dirname(__file__), "valid_passwords.bin"),
+    True: os.path.join(os.path.dirname(__file__), "valid_passwords2.bin"),
+}
+TYPECODE = "I"
+
+
+def build_index(path, group_of_2_only=False, ndigits=6):
+    """
+    Write the sorted list of all the valid ndigits long passwords to a file.
+
+    :param path: Path of the index file.
+    :param group_of_2_only: False to use the rules of password_checker.py, True for the rules of password_checker2.py.
+    :param ndigits: Number of digits in a password, at most 9 so that the passwords fit in 32 bits.
+    :return: The number of valid passwords written.
+    """
+    if not 1 <= ndigits <= 9:
+        raise ValueError("Passwords must have from 1 to 9 digits")
+    rule = password_counter.has_group_of_2 if group_of_2_only else password_counter.has_adjacent_pair
+
+    passwords = array(TYPECODE, (password for password, password_digits in
+                                 password_counter.non_decreasing_passwords(0, 10 ** ndigits - 1, ndigits)
+                                 if rule(password_digits)))
+
+    # Written under a temporary name first, so that an index file is never left half written.
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        passwords.tofile(file)
+    os.replace(temporary_path, path)
+    return len(passwords)
+# end build_index()
+
+
+class PasswordIndex:
+    """
+    Memory-mapped index file written by build_index().
+
+    :param path: Path of the index file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.map = None
+        self.passwords = memoryview(b"").cast(TYPECODE)
+
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size % self.passwords.itemsize:
+                raise ValueError(f"{path} is not a password index file")
+            if size:
+                self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.passwords = memoryview(self.map).cast(TYPECODE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self.passwords)
+
+    def close(self):
+        """
+        Unmap the index file.
+        """
+        self.passwords.release()
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+    def _bounds(self, minimum_value, maximum_value):
+        return bisect_left(self.passwords, minimum_value), bisect_right(self.passwords, maximum_value)
+
+    def count(self, minimum_value, maximum_value):
+        """
+        :return: The number of valid passwords from minimum_value to maximum_value (inclusive).
+        """
+        start, end = self._bounds(minimum_value, maximum_value)
+        return max(0, end - start)
+
+    def passwords_in(self, minimum_value, maximum_value):
+        """
+        :return: A list of the valid passwords from minimum_value to maximum_value (inclusive), in increasing order.
+        """
+        start, end = self._bounds(minimum_value, maximum_value)
+        return self.passwords[start:end].tolist() if start < end else []
+# end class PasswordIndex
+
+
+def open_index(group_of_2_only=False, path=None):
+    """
+    Open the index of a rule set, building it first if the file does not exist yet.
+
+    :param group_of_2_only: False to use the rules of password_checker.py, True for the rules of password_checker2.py.
+    :param path: Path of the index file. Defaults to the file for the rule set in INDEX_FILES.
+    :return: A PasswordIndex.
+    """
+    if path is None:
+        path = INDEX_FILES[group_of_2_only]
+    if not os.path.exists(path):
+        build_index(path, group_of_2_only)
+    return PasswordIndex(path)
+# end open_index()
+
+
+def main(minval=None, maxval=None):
+    """
+    :param minval: Smallest password allowed. Defaults to the range of the puzzle input file.
+    :param maxval: Largest password allowed. Defaults to the range of the puzzle input file.
+    """
+    minval, maxval = password_checker.puzzle_range(minval, maxval)
+    for group_of_2_only in (False, True):
+        with open_index(group_of_2_only) as index:
+            print(f"{index.count(minval, maxval)} valid passwords")
+# end main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Password rules declared as objects and compiled into a single check.
+
+password_checker.py and password_checker2.py each check a password in several passes: str(), building a list of the
+digits, the loop over adjacent digits and then password_digits.count() for every repeating digit. Here every rule gives
+the fragments of Python source it needs, and compile_rules() puts the fragments of all the rules into one function that
+goes over the digits once:
+    * conditions on the integer (like the range) and on the digit string (like the length), checked before the loop.
+    * statements run for every digit after the first, with the digit and the previous one. They can reject the password
+      to stop early, like NonDecreasing does on the first decreasing digit.
+    * statements run at the end of every run of equal digits, with the digit and the length of the run.
+    * an expression checked after the loop.
+The fragments use {p} as the prefix of the names they add, so that the names of two rules never clash, {digit} and
+{previous} for the digits and {reject} to reject the password. Values given by constants() are bound to the prefixed
+names. When a Length rule fixes the number of digits, the loop is unrolled and each digit gets its own local variable.
+
+compile_counter() inlines the same check in a loop counting the valid passwords of an iterable, so that checking a
+password does not even cost a function call.
+
+The rules of password_checker.py are puzzle_rules(minimum_value, maximum_value) and the rules of password_checker2.py
+are puzzle_rules(minimum_value, maximum_value, group_of_2_only=True). A new rule is a new Rule subclass, or any function
+of the digit string wrapped in DigitsRule:
+    check = compile_rules(puzzle_rules(109165, 576723) + [DigitsRule(lambda digits: "7" not in digits)])
+"""
+
+from Day4 import password_checker
+
+
+class Rule:
+    """
+    Base class of the rules. Subclasses set the fragments they need; see the module docstring.
+    """
+
+    # Conditions on the integer password and on its digit string.
+    password_conditions = ()
+    digits_conditions = ()
+    # Statements run before the loop, for every digit after the first (with {digit} and {previous}) and at the end of
+    # every run of equal digits (with {previous} and run).
+    init = ()
+    on_digit = ()
+    on_run_end = ()
+    # Expression that must be true after the loop, or None.
+    result = None
+
+    def constants(self):
+        """
+        :return: A dictionary of the values used by the fragments, by name without the prefix.
+        """
+        return {}
+
+
+class Length(Rule):
+    """
+    The password has ndigits digits.
+    """
+
+    digits_conditions = ("len(digits) == {p}ndigits",)
+
+    def __init__(self, ndigits=6):
+        self.ndigits = ndigits
+
+    def constants(self):
+        return {"ndigits": self.ndigits}
+
+
+class InRange(Rule):
+    """
+    The password is within the range given in the puzzle input, bounds included.
+    """
+
+    password_conditions = ("{p}minimum <= password <= {p}maximum",)
+
+    def __init__(self, minimum_value, maximum_value):
+        self.minimum_value = minimum_value
+        self.maximum_value = maximum_value
+
+    def constants(self):
+        return {"minimum": self.minimum_value, "maximum": self.maximum_value}
+
+
+class NonDecreasing(Rule):
+    """
+    Going from left to right, the digits never decrease.
+    """
+
+    on_digit = ("if {digit} < {previous}:", "    {reject}")
+
+
+class HasAdjacentPair(Rule):
+    """
+    Two adjacent digits are the same (like 22 in 122345).
+    """
+
+    init = ("{p}found = False",)
+    on_run_end = ("if run >= 2:", "    {p}found = True")
+    result = "{p}found"
+
+
+class HasGroupOf2(Rule):
+    """
+    There is a group of exactly two adjacent matching digits (like 22 in 111122). Along with NonDecreasing this is the
+    rule of password_checker2.py, as all copies of a digit are then adjacent.
+    """
+
+    init = ("{p}found = False",)
+    on_run_end = ("if run == 2:", "    {p}found = True")
+    result = "{p}found"
+
+
+class DigitsRule(Rule):
+    """
+    Any function given the digit string that returns True for a valid password. It is called after the loop, so only
+    when the other rules did not already reject the password.
+    """
+
+    result = "{p}function(digits)"
+
+    def __init__(self, function):
+        self.function = function
+
+    def constants(self):
+        return {"function": self.function}
+
+
+def puzzle_rules(minimum_value, maximum_value, group_of_2_only=False):
+    """
+    :param minimum_value: Smallest password allowed.
+    :param maximum_value: Largest password allowed.
+    :param group_of_2_only: False for the rules of password_checker.py, True for the rules of password_checker2.py.
+    :return: A list of the rules of the puzzle.
+    """
+    return [InRange(minimum_value, maximum_value), Length(6), NonDecreasing(),
+            HasGroupOf2() if group_of_2_only else HasAdjacentPair()]
+
+
+def _format(statements, indent, reject, digit="digit", previous="previous"):
+    return [indent + statement.format(digit=digit, previous=previous, reject=reject) for statement in statements]
+
+
+def _collect_fragments(rules):
+    """
+    Gather the fragments of all the rules, with the {p} prefix of every rule filled in.
+
+    :return: (dictionary of fragments by kind, dictionary of constants, number of digits fixed by a Length rule or
+    None).
+    """
+    fragments = {"password_conditions": [], "digits_conditions": [], "init": [], "on_digit": [], "on_run_end": [],
+                 "result": []}
+    constants = {}
+    ndigits = None
+
+    for indx, rule in enumerate(rules):
+        prefix = f"r{indx}_"
+        for kind in fragments:
+            rule_fragments = getattr(rule, kind)
+            if kind == "result":
+                rule_fragments = () if rule_fragments is None else (rule_fragments,)
+            # Only {p} is filled in here, the other fields are kept for when the check is written.
+            fragments[kind].extend(fragment.format(p=prefix, digit="{digit}", previous="{previous}", reject="{reject}")
+                                   for fragment in rule_fragments)
+        for name, value in rule.constants().items():
+            constants[prefix + name] = value
+        if isinstance(rule, Length):
+            ndigits = rule.ndigits
+
+    return fragments, constants, ndigits
+# end _collect_fragments()
+
+
+def _check_lines(fragments, ndigits, indent, reject, accept):
+    """
+    Lines checking the integer password. They run reject for an invalid password and accept for a valid one.
+    """
+    lines = []
+    for condition in fragments["password_conditions"]:
+        lines += [f"{indent}if not ({condition}):", f"{indent}    {reject}"]
+    lines.append(f"{indent}digits = str(password)")
+    for condition in fragments["digits_conditions"]:
+        lines += [f"{indent}if not ({condition}):", f"{indent}    {reject}"]
+    lines += _format(fragments["init"], indent, reject)
+
+    on_digit = fragments["on_digit"]
+    on_run_end = fragments["on_run_end"]
+    result = " and ".join(f"({expression})" for expression in fragments["result"]) or "True"
+
+    if not on_digit and not on_run_end:
+        return lines + [indent + accept.format(result=result)]
+
+    if ndigits:
+        # The number of digits is known: unroll the loop over them.
+        names = [f"d{indx}" for indx in range(ndigits)]
+        lines.append(f"{indent}{', '.join(names)}, = digits")
+        if on_run_end:
+            lines.append(f"{indent}run = 1")
+        for previous, digit in zip(names, names[1:]):
+            lines += _format(on_digit, indent, reject, digit, previous)
+            if on_run_end:
+                lines += [f"{indent}if {digit} == {previous}:",
+                          f"{indent}    run += 1",
+                          f"{indent}else:"]
+                lines += _format(on_run_end, indent + "    ", reject, digit, previous)
+                lines.append(f"{indent}    run = 1")
+        lines += _format(on_run_end, indent, reject, None, names[-1])
+        return lines + [indent + accept.format(result=result)]
+
+    # A rejection inside the loop over the digits breaks out of it, which skips the else clause accepting the password.
+    lines += [f"{indent}previous = digits[0]",
+              f"{indent}run = 1",
+              f"{indent}for digit in digits[1:]:"]
+    lines += _format(on_digit, indent + "    ", "break")
+    if on_run_end:
+        lines += [f"{indent}    if digit == previous:",
+                  f"{indent}        run += 1",
+                  f"{indent}    else:"]
+        lines += _format(on_run_end, indent + "        ", "break")
+        lines.append(f"{indent}        run = 1")
+    lines += [f"{indent}    previous = digit",
+              f"{indent}else:"]
+    # The last run ends with the digits.
+    lines += _format(on_run_end, indent + "    ", reject, None, "previous")
+    lines.append(f"{indent}    {accept.format(result=result)}")
+    return lines
+# end _check_lines()
+
+
+def generate_source(rules, counter=False):
+    """
+    Generate the Python source of the fused check.
+
+    :param rules: Iterable of Rule objects.
+    :param counter: False to generate check(password), True to generate count(passwords) with the check inlined in the
+    loop over the passwords.
+    :return: (source of the function, dictionary of the constants it uses).
+    """
+    fragments, constants, ndigits = _collect_fragments(rules)
+
+    if not counter:
+        lines = ["def check(password):",
+                 "    if not isinstance(password, int):",
+                 "        return False"]
+        lines += _check_lines(fragments, ndigits, "    ", "return False", "return bool({result})")
+        lines.append("    return False")
+    else:
+        lines = ["def count(passwords):",
+                 "    valid_count = 0",
+                 "    for password in passwords:",
+                 "        if not isinstance(password, int):",
+                 "            continue"]
+        lines += _check_lines(fragments, ndigits, "        ", "continue", "if {result}: valid_count += 1")
+        lines.append("    return valid_count")
+
+    return "\n".join(lines) + "\n", constants
+# end generate_source()
+
+
+def _compile(rules, counter, name):
+    source, constants = generate_source(rules, counter)
+    namespace = dict(constants)
+    exec(compile(source, "<password rules>", "exec"), namespace)
+    return namespace[name]
+
+
+def compile_rules(rules):
+    """
+    Compile the rules into a single check.
+
+    :param rules: Iterable of Rule objects, checked in the given order.
+    :return: A function check(password) returning True when the integer password meets every rule.
+    """
+    return _compile(rules, False, "check")
+
+
+def compile_counter(rules):
+    """
+    Compile the rules into a loop counting the valid passwords, which saves a function call per password.
+
+    :param rules: Iterable of Rule objects, checked in the given order.
+    :return: A function count(passwords) giving the number of valid passwords in an iterable of passwords.
+    """
+    return _compile(rules, True, "count")
+
+
+def main(minval=None, maxval=None):
+    """
+    :param minval: Smallest password allowed. Defaults to the range of the puzzle input file.
+    :param maxval: Largest password allowed. Defaults to the range of the puzzle input file.
+    """
+    minval, maxval = password_checker.puzzle_range(minval, maxval)
+    for group_of_2_only in (False, True):
+        count = compile_counter(puzzle_rules(minval, maxval, group_of_2_only))
+        print(f"{count(range(minval, maxval + 1))} valid passwords")
+# end main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Single command line runner for all the days.
+
+Only the module of the requested day and part is imported, so running one solver does not pay for loading the others.
+The answer is printed by the solver's main() and the time taken is printed to standard error.
+
+Usage:
+    python -m aoc DAY PART [INPUT] [--profile FILE [--profile-function MODULE:FUNCTION] [--cprofile]]
+
+For example:
+    python -m aoc 3 2                       # Day3/best_from_central.py on Day3/input.txt
+    python -m aoc 1 1 masses.txt            # Day1/question1.py on another input file
+    cat wires.txt | python -m aoc 3 1 -     # input from standard input
+
+With --profile, the run is measured by profiling.ProfileSession and the report is written as JSON to the given file.
+The profiling module is only imported when profiling is asked for, and the solver is imported before profiling starts.
+For day 2, "--profile-function Day2.intcode:IntcodeVM.run" times every run of the program.
+"""
+
+import argparse
+import importlib
+import sys
+import time
+
+import puzzle_input
+
+# (day, part) -> (solver module, loader turning the input source into the argument(s) of its main()).
+SOLVERS = {
+    (1, 1): ("Day1.question1", lambda source: (puzzle_input.iter_masses(source),)),
+    (1, 2): ("Day1.question2", lambda source: (puzzle_input.iter_masses(source),)),
+    (2, 1): ("Day2.opcode", lambda source: (puzzle_input.iter_opcodes(source),)),
+    (2, 2): ("Day2.question2", lambda source: (puzzle_input.iter_opcodes(source),)),
+    (3, 1): ("Day3.closest_to_central", lambda source: (puzzle_input.iter_wires(source),)),
+    (3, 2): ("Day3.best_from_central", lambda source: (puzzle_input.iter_wires(source),)),
+    (4, 1): ("Day4.password_checker", puzzle_input.read_range),
+    (4, 2): ("Day4.password_checker2", puzzle_input.read_range),
+}
+
+
+def import_solver(day, part):
+    """
+    Import the solver module for the day and part.
+
+    :param day: Day number, 1 to 4.
+    :param part: Part number, 1 or 2.
+    :return: (solver module, loader of its input, seconds taken to import it).
+    """
+    if (day, part) not in SOLVERS:
+        raise ValueError(f"There is no solver for day {day} part {part}")
+    module_name, load = SOLVERS[(day, part)]
+
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    return module, load, time.perf_counter() - start
+# end import_solver()
+
+
+def run_solver(module, load, source=None):
+    """
+    Run the main() of a solver module imported by import_solver() on the input.
+
+    :param source: A file path, an open text file, or "-" for standard input. Defaults to the day's own input file.
+    :return: Seconds taken by its main().
+    """
+    start = time.perf_counter()
+    if source is None:
+        module.main()
+    else:
+        module.main(*load(source))
+    return time.perf_counter() - start
+# end run_solver()
+
+
+def run(day, part, source=None):
+    """
+    Import the solver for the day and part and run its main() on the input.
+
+    :param day: Day number, 1 to 4.
+    :param part: Part number, 1 or 2.
+    :param source: A file path, an open text file, or "-" for standard input. Defaults to the day's own input file.
+    :return: (seconds taken to import the solver, seconds taken by its main()).
+    """
+    module, load, import_seconds = import_solver(day, part)
+    return import_seconds, run_solver(module, load, source)
+# end run()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m aoc", description="Run the solver for a day and part.")
+    parser.add_argument("day", type=int, help="day number")
+    parser.add_argument("part", type=int, choices=(1, 2), help="part number")
+    parser.add_argument("input", nargs="?", help="input file, or - for standard input (default: the day's input.txt)")
+    parser.add_argument("--profile", metavar="FILE", help="profile the run and write the report as JSON to FILE")
+    parser.add_argument("--profile-function", action="append", default=[], metavar="MODULE:FUNCTION",
+                        help="also profile this function on its own, for example Day3.closest_to_central:build_graph")
+    parser.add_argument("--cprofile", action="store_true", help="add cProfile statistics to the profile report")
+    args = parser.parse_args(argv)
+    if (args.profile_function or args.cprofile) and not args.profile:
+        parser.error("--profile-function and --cprofile need --profile")
+
+    # The solver is imported before profiling starts, so that importing it is not counted as part of the run, nor the
+    # run as part of the import when a profiled function lives in the solver module.
+    try:
+        module, load, import_seconds = import_solver(args.day, args.part)
+    except ValueError as error:
+        parser.error(str(error))
+
+    session = None
+    if args.profile:
+        import profiling
+        session = profiling.ProfileSession(args.profile_function, args.cprofile)
+        try:
+            session.start()
+        except (ImportError, AttributeError, ValueError) as error:
+            parser.error(f"cannot profile: {error}")
+
+    try:
+        run_seconds = run_solver(module, load, args.input)
+    except ValueError as error:
+        parser.error(str(error))
+    finally:
+        if session is not None:
+            session.stop()
+
+    if session is not None:
+        session.write(args.profile, day=args.day, part=args.part, input=args.input, import_seconds=import_seconds,
+                      run_seconds=run_seconds)
+
+    print(f"Day {args.day} part {args.part}: imported in {import_seconds * 1000:.1f} ms, "
+          f"solved in {run_seconds * 1000:.1f} ms", file=sys.stderr)
+# end main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+Benchmarks for the hot path of every day, run on synthetic inputs of growing size.
+
+    Day 1   question2.calculate_full_fuel_requirement() over random module masses.
+    Day 2   IntcodeVM.run() on random add/multiply programs, interpreted and compiled.
+    Day 3   closest_to_central.build_graph() on two random wires, then intersecting their cells.
+    Day 4   is_password_valid() from password_checker.py and password_checker2.py over ranges of passwords, and the
+            same rules compiled by password_rules.py into a single check and into a counting loop.
+
+Every benchmark is timed a few times and the best time is kept. The results are written as JSON together with the git
+commit they were measured on, so the results of two commits can be compared.
+
+Usage:
+    python -m benchmark [--output results.json] [--repeat 3] [--scale 1.0] [--compare old_results.json]
+"""
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+
+from Day1 import question2 as fuel
+from Day2 import intcode
+from Day2 import intcode_compiler
+from Day3 import closest_to_central
+from Day4 import password_checker
+from Day4 import password_checker2
+from Day4 import password_rules
+
+# Input sizes for each benchmark, multiplied by --scale.
+SIZES = {
+    "day1_full_fuel": (1_000, 10_000, 100_000),
+    "day2_intcode_run": (100, 1_000, 10_000),
+    "day2_intcode_compiled_run": (100, 1_000, 10_000),
+    "day3_build_graph_intersect": (100, 300, 1_000),
+    "day4_is_password_valid": (10_000, 100_000, 1_000_000),
+    "day4_is_password_valid2": (10_000, 100_000, 1_000_000),
+    "day4_password_rules_check2": (10_000, 100_000, 1_000_000),
+    "day4_password_rules_counter2": (10_000, 100_000, 1_000_000),
+}
+
+
+def random_masses(count, seed=0):
+    """
+    Module masses in the same range as the puzzle input.
+    """
+    rng = random.Random(seed)
+    return [rng.randint(50_000, 150_000) for _ in range(count)]
+
+
+def random_intcode_program(n_instructions, seed=0, data_size=64):
+    """
+    An add/multiply Intcode program that never writes into its own code. The instructions read from a block of
+    constants and write to a block of scratch cells placed after the halt instruction. The last instruction stores its
+    result at address 0, like the gravity assist program.
+
+    :param n_instructions: Number of add and multiply instructions.
+    :param seed: Seed of the random number generator.
+    :param data_size: Number of constant cells and of scratch cells.
+    :return: The program as a list of integers.
+    """
+    rng = random.Random(seed)
+    halt_address = 4 * n_instructions
+    constants = range(halt_address + 1, halt_address + 1 + data_size)
+    scratch = range(constants.stop, constants.stop + data_size)
+
+    program = []
+    for idx in range(n_instructions):
+        opcode = 2 if rng.random() < 0.3 else 1
+        result_loc = 0 if idx == n_instructions - 1 else rng.choice(scratch)
+        program.extend((opcode, rng.choice(constants), rng.choice(constants), result_loc))
+    program.append(intcode.HALT)
+    program.extend(rng.randint(0, 100) for _ in constants)
+    program.extend(0 for _ in scratch)
+
+    return program
+# end random_intcode_program()
+
+
+def random_wire(n_moves, seed=0, max_run=1_000):
+    """
+    A wire of n_moves codes with runs of up to max_run steps, like the puzzle input.
+    """
+    rng = random.Random(seed)
+    return [f"{rng.choice('RLUD')}{rng.randint(1, max_run)}" for _ in range(n_moves)]
+
+
+def password_range(width, minimum_value=100_000):
+    """
+    A password range starting at minimum_value and holding width passwords.
+    """
+    return minimum_value, minimum_value + width - 1
+
+
+def _bench_full_fuel(size):
+    masses = random_masses(size)
+
+    def run():
+        for mass in masses:
+            fuel.calculate_full_fuel_requirement(mass)
+    return run
+
+
+def _bench_intcode_run(size):
+    vm = intcode.IntcodeVM(random_intcode_program(size))
+
+    def run():
+        vm.run()
+    return run
+
+
+def _bench_intcode_compiled_run(size):
+    vm = intcode_compiler.CompiledIntcodeVM(random_intcode_program(size))
+
+    def run():
+        vm.run()
+    return run
+
+
+def _bench_build_graph_intersect(size):
+    wire1, wire2 = random_wire(size, seed=1), random_wire(size, seed=2)
+
+    def run():
+        coordinates1 = closest_to_central.build_graph(wire1)
+        coordinates2 = closest_to_central.build_graph(wire2)
+        set(coordinates1) & set(coordinates2)
+    return run
+
+
+def _bench_is_password_valid(module):
+    def bench(size):
+        minimum_value, maximum_value = password_range(size)
+
+        def run():
+            for pswd in range(minimum_value, maximum_value + 1):
+                module.is_password_valid(pswd, minimum_value, maximum_value)
+        return run
+    return bench
+
+
+def _bench_password_rules_check(size):
+    minimum_value, maximum_value = password_range(size)
+    check = password_rules.compile_rules(password_rules.puzzle_rules(minimum_value, maximum_value, True))
+
+    def run():
+        for pswd in range(minimum_value, maximum_value + 1):
+            check(pswd)
+    return run
+
+
+def _bench_password_rules_counter(size):
+    minimum_value, maximum_value = password_range(size)
+    count = password_rules.compile_counter(password_rules.puzzle_rules(minimum_value, maximum_value, True))
+
+    def run():
+        count(range(minimum_value, maximum_value + 1))
+    return run
+
+
+BENCHMARKS = {
+    "day1_full_fuel": _bench_full_fuel,
+    "day2_intcode_run": _bench_intcode_run,
+    "day2_intcode_compiled_run": _bench_intcode_compiled_run,
+    "day3_build_graph_intersect": _bench_build_graph_intersect,
+    "day4_is_password_valid": _bench_is_password_valid(password_checker),
+    "day4_is_password_valid2": _bench_is_password_valid(password_checker2),
+    "day4_password_rules_check2": _bench_password_rules_check,
+    "day4_password_rules_counter2": _bench_password_rules_counter,
+}
+
+
+def time_best(func, repeat):
+    """
+    Best wall clock time of repeat calls to func, in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(names=None, repeat=3, scale=1.0):
+    """
+    Run the benchmarks at all their sizes.
+
+    :param names: Names of the benchmarks to run. Defaults to all of them.
+    :param repeat: Number of times every benchmark is timed.
+    :param scale: Factor applied to every input size.
+    :return: The results as a dictionary ready to be written as JSON.
+    """
+    results = []
+    for name in names or BENCHMARKS:
+        for size in SIZES[name]:
+            size = max(1, int(size * scale))
+            seconds = time_best(BENCHMARKS[name](size), repeat)
+            results.append({"name": name, "size": size, "seconds": seconds})
+            print(f"{name:<30} size {size:>10}  {seconds * 1000:10.2f} ms", file=sys.stderr)
+
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "repeat": repeat,
+        "results": results,
+    }
+# end run_benchmarks()
+
+
+def compare(old, new):
+    """
+    Print the time ratio new / old for the benchmarks found in both results.
+    """
+    old_seconds = {(r["name"], r["size"]): r["seconds"] for r in old["results"]}
+    print(f"{old['commit']} -> {new['commit']}")
+    for r in new["results"]:
+        key = (r["name"], r["size"])
+        if key in old_seconds:
+            print(f"{r['name']:<30} size {r['size']:>10}  {r['seconds'] / old_seconds[key]:6.2f}x")
+# end compare()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmark", description="Benchmark every day's hot path.")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run (default: all): {', '.join(BENCHMARKS)}")
+    parser.add_argument("--output", help="write the results as JSON to this file (default: standard output)")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timings per benchmark, the best is kept")
+    parser.add_argument("--scale", type=float, default=1.0, help="factor applied to every input size")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    args = parser.parse_args(argv)
+    for name in args.names:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark {name}")
+
+    results = run_benchmarks(args.names, args.repeat, args.scale)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(json.load(file), results)
+# end main()
+
+
+if __name__ == "__main__":
+    main()
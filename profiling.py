@@ -0,0 +1,239 @@
+"""
+Opt-in profiling of the solvers: time, CPU, memory and allocation sites, written as JSON.
+
+A ProfileSession measures everything run between start() and stop() (or inside a with block):
+    * wall clock and CPU time.
+    * the peak of the memory allocated by Python, from tracemalloc.
+    * the allocation sites holding the most memory, grouped by line. A sampler thread checks the memory in use every
+      SAMPLE_INTERVAL seconds, and so does every profiled function when it returns. A snapshot is made whenever there
+      is clearly more memory in use (a quarter more, and at least SNAPSHOT_STEP bytes) than at the last snapshot, so
+      the sites are those found near the peak rather than what is left when the session stops. The end of the session
+      only makes a snapshot when there was none. Snapshots of a large heap are slow, and the time they took is
+      reported as snapshot_seconds since it is part of the wall clock time.
+    * optionally, cProfile statistics of the functions that took the most time.
+
+Functions can also be profiled on their own, for example closest_to_central.build_graph() or IntcodeVM.run(). The
+session then replaces them by a wrapper counting their calls and adding up their wall and CPU time, and puts the
+originals back when it stops. Targets are named "module:attribute", like "Day2.intcode:IntcodeVM.run". Only the calls
+made through that attribute are seen, not those through a copy imported with "from module import name", nor those of a
+subclass overriding it: question2.py runs programs with intcode_compiler.CompiledIntcodeVM, whose execute() replaces
+IntcodeVM.execute(), so "Day2.intcode:IntcodeVM.run" (inherited by both) times every run, while
+"Day2.intcode_compiler:CompiledIntcodeVM.execute" only times the compiled one. Calls made from inside a call to the same
+function (recursion) are counted but not timed twice.
+
+Nothing is wrapped or traced unless a session is running, so the solvers cost nothing extra when profiling is off. From
+the command line, profiling is turned on by the options of aoc.py:
+    python -m aoc 3 1 --profile profile.json --profile-function Day3.closest_to_central:build_graph --cprofile
+"""
+
+import cProfile
+import functools
+import importlib
+import json
+import platform
+import pstats
+import threading
+import time
+import tracemalloc
+
+# Least growth of the memory in use between two allocation snapshots, in bytes.
+SNAPSHOT_STEP = 1 << 20
+# Seconds between two checks of the memory in use by the sampler thread.
+SAMPLE_INTERVAL = 0.005
+
+
+def resolve(target):
+    """
+    Find the object named by a "module:attribute" target.
+
+    :param target: For example "Day3.closest_to_central:build_graph" or "Day2.intcode:IntcodeVM.run".
+    :return: (object holding the attribute, attribute name, current value of the attribute).
+    """
+    module_name, _, attribute_path = target.partition(":")
+    if not attribute_path:
+        raise ValueError(f"Profiling target {target!r} must look like module:attribute")
+
+    owner = importlib.import_module(module_name)
+    *owner_path, name = attribute_path.split(".")
+    for attribute in owner_path:
+        owner = getattr(owner, attribute)
+    return owner, name, getattr(owner, name)
+# end resolve()
+
+
+class ProfileSession:
+    """
+    Collects the profile of everything run while the session is started.
+
+    :param functions: "module:attribute" targets of functions to profile on their own.
+    :param use_cprofile: True to also record cProfile statistics.
+    :param top: Number of allocation sites and cProfile entries kept in the report.
+    """
+
+    def __init__(self, functions=(), use_cprofile=False, top=10):
+        self.targets = list(functions)
+        self.use_cprofile = use_cprofile
+        self.top = top
+        self.functions = {}
+        self.report = None
+        self._patched = []
+        self._profile = None
+        self._snapshot = None
+        self._snapshot_memory = 0
+        self._snapshot_seconds = 0.0
+        self._snapshot_lock = threading.Lock()
+        self._sampler = None
+        self._stop_sampling = threading.Event()
+        self._started_tracing = False
+        self._start_wall = None
+        self._start_cpu = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _wrap(self, target, func):
+        stats = self.functions.setdefault(target, {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0})
+        depth = [0]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stats["calls"] += 1
+            if depth[0]:
+                return func(*args, **kwargs)
+
+            depth[0] += 1
+            start_wall, start_cpu = time.perf_counter(), time.process_time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats["wall_seconds"] += time.perf_counter() - start_wall
+                stats["cpu_seconds"] += time.process_time() - start_cpu
+                depth[0] -= 1
+                self._snapshot_if_highest()
+
+        return wrapper
+    # end _wrap()
+
+    def _snapshot_if_highest(self):
+        with self._snapshot_lock:
+            current, _ = tracemalloc.get_traced_memory()
+            if current >= self._snapshot_memory + max(self._snapshot_memory // 4, SNAPSHOT_STEP):
+                self._snapshot_memory = current
+                start = time.perf_counter()
+                self._snapshot = tracemalloc.take_snapshot()
+                self._snapshot_seconds += time.perf_counter() - start
+
+    def _sample(self):
+        while not self._stop_sampling.wait(SAMPLE_INTERVAL):
+            self._snapshot_if_highest()
+
+    def _unpatch(self):
+        for owner, name, func in reversed(self._patched):
+            setattr(owner, name, func)
+        self._patched.clear()
+
+    def start(self):
+        """
+        Patch the profiled functions and start measuring. If a target cannot be found, the functions already patched
+        are put back before the error is raised.
+        """
+        try:
+            for target in self.targets:
+                owner, name, func = resolve(target)
+                self._patched.append((owner, name, func))
+                setattr(owner, name, self._wrap(target, func))
+        except Exception:
+            self._unpatch()
+            raise
+
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self._stop_sampling.clear()
+        self._sampler = threading.Thread(target=self._sample, name="profiling-sampler", daemon=True)
+        self._sampler.start()
+
+        if self.use_cprofile:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        self._start_wall, self._start_cpu = time.perf_counter(), time.process_time()
+    # end start()
+
+    def stop(self):
+        """
+        Stop measuring, put the profiled functions back and build the report.
+
+        :return: The report as a dictionary ready to be written as JSON.
+        """
+        wall_seconds = time.perf_counter() - self._start_wall
+        cpu_seconds = time.process_time() - self._start_cpu
+        if self._profile is not None:
+            self._profile.disable()
+        self._stop_sampling.set()
+        self._sampler.join()
+
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        if self._snapshot is None:
+            self._snapshot = tracemalloc.take_snapshot()
+        if self._started_tracing:
+            tracemalloc.stop()
+
+        self._unpatch()
+
+        self.report = {
+            "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "wall_seconds": wall_seconds,
+            "cpu_seconds": cpu_seconds,
+            "peak_bytes": peak_bytes,
+            "current_bytes": current_bytes,
+            "snapshot_seconds": self._snapshot_seconds,
+            "top_allocations": self._top_allocations(),
+            "functions": self.functions,
+        }
+        if self._profile is not None:
+            self.report["cprofile"] = self._top_cprofile()
+        return self.report
+    # end stop()
+
+    def _top_allocations(self):
+        snapshot = self._snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),
+                                                 tracemalloc.Filter(False, __file__)))
+        return [{"file": stat.traceback[0].filename, "line": stat.traceback[0].lineno, "bytes": stat.size,
+                 "blocks": stat.count}
+                for stat in snapshot.statistics("lineno")[:self.top]]
+
+    def _top_cprofile(self):
+        stats = pstats.Stats(self._profile).stats
+        rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:self.top]
+        return [{"function": pstats.func_std_string(func), "calls": calls, "primitive_calls": primitive_calls,
+                 "total_seconds": total_seconds, "cumulative_seconds": cumulative_seconds}
+                for func, (primitive_calls, calls, total_seconds, cumulative_seconds, _) in rows]
+
+    def write(self, path, **extra):
+        """
+        Write the report as JSON.
+
+        :param path: Output file path.
+        :param extra: Additional fields added to the report, like the solver that was run.
+        """
+        with open(path, "w") as file:
+            json.dump({**extra, **self.report}, file, indent=2)
+# end class ProfileSession
+
+
+def profile_call(func, *args, functions=(), use_cprofile=False, top=10, **kwargs):
+    """
+    Run a single call under a ProfileSession.
+
+    :return: (the value returned by func, the report).
+    """
+    with ProfileSession(functions, use_cprofile, top) as session:
+        result = func(*args, **kwargs)
+    return result, session.report
+# end profile_call()
@@ -0,0 +1,141 @@
+"""
+Streaming puzzle input loaders shared by all the days.
+
+Puzzle inputs are read from a file path, an open file or standard input (when the source is None or "-"). The text is
+read a chunk at a time and split into tokens on the fly, so only the current chunk and a partial token are kept in
+memory however large the input is. Files of at least MMAP_THRESHOLD bytes are read through a memory map instead of
+buffered reads.
+
+    iter_masses(source)     Day 1 module masses, one per line:                  12 \\n 14 \\n 1969
+    iter_opcodes(source)    Day 2 Intcode program, comma separated:             1,9,10,3,2,3,11,0,99
+    iter_wires(source)      Day 3 wires, one comma separated wire per line:     R8,U5,L5,D3 \\n U7,R6,D4,L4
+    read_range(source)      Day 4 password range:                               109165-576723
+"""
+
+import mmap
+import os
+import sys
+from itertools import groupby
+
+CHUNK_SIZE = 1 << 20
+MMAP_THRESHOLD = 64 << 20
+
+
+def _iter_mmap_chunks(file, chunk_size):
+    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for start in range(0, len(mapped), chunk_size):
+            yield mapped[start:start + chunk_size].decode("ascii")
+
+
+def iter_chunks(source=None, chunk_size=CHUNK_SIZE, use_mmap=None):
+    """
+    Read the input a chunk of text at a time.
+
+    :param source: A file path, an open text file, or None / "-" for standard input.
+    :param chunk_size: Number of characters read at a time.
+    :param use_mmap: True to memory map the file, False to use buffered reads. By default files of at least
+    MMAP_THRESHOLD bytes are memory mapped. Only used when source is a file path.
+    :return: A generator of text chunks.
+    """
+    if source is None or source == "-":
+        source = sys.stdin
+
+    if not isinstance(source, (str, os.PathLike)):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    if use_mmap is None:
+        use_mmap = os.path.getsize(source) >= MMAP_THRESHOLD
+
+    if use_mmap:
+        with open(source, "rb") as file:
+            yield from _iter_mmap_chunks(file, chunk_size)
+    else:
+        with open(source) as file:
+            yield from iter_chunks(file, chunk_size)
+# end iter_chunks()
+
+
+def iter_tokens(source=None, separator=",", chunk_size=CHUNK_SIZE, use_mmap=None):
+    """
+    Split the input into tokens separated by the separator or by line breaks. Blank tokens are skipped.
+
+    For example, "R8,U5\\nU7,R6\\n" gives (0, "R8"), (0, "U5"), (1, "U7"), (1, "R6").
+
+    :param source: A file path, an open text file, or None / "-" for standard input.
+    :param separator: Character separating the tokens on a line.
+    :param chunk_size: Number of characters read at a time.
+    :param use_mmap: See iter_chunks().
+    :return: A generator of (line number, token) tuples.
+    """
+    line_number = 0
+    pending = ""
+
+    for chunk in iter_chunks(source, chunk_size, use_mmap):
+        lines = (pending + chunk).split("\n")
+
+        for line in lines[:-1]:
+            for token in line.split(separator):
+                token = token.strip()
+                if token:
+                    yield line_number, token
+            line_number += 1
+
+        # The last token of the last line may continue in the next chunk.
+        tokens = lines[-1].split(separator)
+        pending = tokens.pop()
+        for token in tokens:
+            token = token.strip()
+            if token:
+                yield line_number, token
+
+    pending = pending.strip()
+    if pending:
+        yield line_number, pending
+# end iter_tokens()
+
+
+def iter_masses(source=None, **kwargs):
+    """
+    Stream the module masses of day 1 as integers.
+    """
+    for _, token in iter_tokens(source, **kwargs):
+        yield int(token)
+
+
+def iter_opcodes(source=None, **kwargs):
+    """
+    Stream the comma separated Intcode program of day 2 as integers.
+    """
+    for _, token in iter_tokens(source, **kwargs):
+        yield int(token)
+
+
+def iter_wires(source=None, **kwargs):
+    """
+    Stream the wires of day 3. Every wire is itself a generator of its codes (like "R8"), which has to be used up before
+    moving on to the next wire. Blank lines are skipped.
+
+    For example:
+        wires = iter_wires("input.txt")
+        coordinates1 = closest_to_central.build_graph(next(wires))
+        coordinates2 = closest_to_central.build_graph(next(wires))
+    """
+    for _, tokens in groupby(iter_tokens(source, **kwargs), key=lambda item: item[0]):
+        yield (token for _, token in tokens)
+# end iter_wires()
+
+
+def read_range(source=None, **kwargs):
+    """
+    Read the password range of day 4, given as "minimum-maximum".
+
+    :return: (minimum value, maximum value).
+    """
+    text = "".join(token for _, token in iter_tokens(source, **kwargs))
+    minimum_value, maximum_value = text.split("-")
+    return int(minimum_value), int(maximum_value)
+# end read_range()
@@ -0,0 +1,280 @@
+"""
+Local asyncio service running the solvers of all the days.
+
+Clients connect over TCP or a Unix socket and send jobs as JSON, one per line. Every job is answered with one JSON line
+as soon as its result is ready, so the results of a connection stream back in the order they finish rather than the
+order they were sent. The "id" given with a job is copied to its result.
+
+    {"id": 1, "day": 1, "part": 2, "masses": [12, 1969]}                 -> {"id": 1, "answer": 968}
+    {"id": 2, "day": 2, "part": 1, "program": [1, 9, 10, ...]}           -> {"id": 2, "answer": 3500}
+    {"id": 3, "day": 2, "part": 2, "program": [...], "target": 19690720} -> {"id": 3, "answer": 8478}
+    {"id": 4, "day": 3, "part": 2, "wires": [["R8", "U5"], ["U7", "R6"]]} -> {"id": 4, "answer": ...}
+    {"id": 5, "day": 4, "part": 1, "range": [109165, 576723]}            -> {"id": 5, "answer": 2814}
+
+Day 2 part 1 runs the program with noun 12 and verb 2 unless "noun" and "verb" are given. A job that cannot be solved is
+answered with {"id": ..., "error": "..."}.
+
+The CPU bound work runs in a bounded process pool and at most max_pending jobs are queued for it at a time. Day 1 jobs
+are small, so those arriving within batch_window seconds of each other are sent to the pool as a single batch.
+
+Usage:
+    python -m solver_service [--host 127.0.0.1] [--port 8765] [--unix PATH] [--workers N]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from Day1 import fuel_batch
+from Day2 import intcode
+from Day2 import linear_solver
+from Day3 import wire_segments
+from Day4 import password_counter
+
+# Longest job line accepted, in bytes.
+MAX_LINE = 64 << 20
+
+
+def solve(job):
+    """
+    Solve a single job. Runs in a worker process.
+
+    :param job: A job dictionary as described in the module docstring.
+    :return: The answer.
+    """
+    day, part = job["day"], job["part"]
+
+    if day == 1:
+        check_fuel_job(job)
+        answer, error = solve_fuel_batch([job["masses"]], [part])[0]
+        if error is not None:
+            raise error
+        return answer
+    if day == 2 and part == 1:
+        return intcode.IntcodeVM(job["program"]).run(job.get("noun", 12), job.get("verb", 2))
+    if day == 2 and part == 2:
+        noun_verb = linear_solver.solve_noun_verb(job["program"], job.get("target", 19690720))
+        return None if noun_verb is None else 100 * noun_verb[0] + noun_verb[1]
+    if day == 3 and part == 1:
+        return wire_segments.closest_distance(*job["wires"])
+    if day == 3 and part == 2:
+        return wire_segments.fewest_combined_steps(*job["wires"])
+    if day == 4 and part in (1, 2):
+        minimum_value, maximum_value = job["range"]
+        return password_counter.count_passwords(minimum_value, maximum_value, group_of_2_only=part == 2)
+
+    raise ValueError(f"There is no solver for day {day} part {part}")
+# end solve()
+
+
+def check_fuel_job(job):
+    """
+    Check a day 1 job before it joins a batch, so that a bad job is answered with an error of its own.
+
+    :param job: A job dictionary as described in the module docstring.
+    """
+    if job.get("part") not in (1, 2):
+        raise ValueError(f"There is no solver for day 1 part {job.get('part')}")
+    masses = job.get("masses")
+    if not isinstance(masses, list) or not all(type(mass) is int for mass in masses):
+        raise ValueError("Day 1 jobs need \"masses\" as a list of integers")
+# end check_fuel_job()
+
+
+def solve_fuel_batch(mass_lists, parts):
+    """
+    Solve a batch of day 1 jobs. Runs in a worker process.
+
+    :param mass_lists: The module masses of every job.
+    :param parts: The part asked by every job.
+    :return: An (answer, error) pair for every job, where error is None or the exception raised by that job only.
+    """
+    results = []
+    for masses, part in zip(mass_lists, parts):
+        try:
+            results.append((fuel_batch.fuel_totals(masses)[part - 1], None))
+        except Exception as error:
+            results.append((None, error))
+    return results
+# end solve_fuel_batch()
+
+
+class SolverService:
+    """
+    Serves the solvers over asyncio streams.
+
+    :param workers: Number of worker processes. Defaults to the number of CPUs.
+    :param max_pending: Most jobs handed to the process pool at a time.
+    :param batch_window: Seconds day 1 jobs are held for to be batched together.
+    :param batch_size: Most day 1 jobs in a batch.
+    """
+
+    def __init__(self, workers=None, max_pending=64, batch_window=0.005, batch_size=256):
+        # Forked workers would inherit the open client sockets and keep connections from closing, so the workers are
+        # spawned instead.
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self.pending = asyncio.Semaphore(max_pending)
+        self.batch_window = batch_window
+        self.batch_size = batch_size
+        self.fuel_jobs = asyncio.Queue()
+        self.batcher = None
+        # The event loop only keeps weak references to tasks, so the running batches are kept here.
+        self.batch_tasks = set()
+
+    async def close(self):
+        if self.batcher is not None:
+            self.batcher.cancel()
+        for task in self.batch_tasks:
+            task.cancel()
+        self.executor.shutdown(cancel_futures=True)
+
+    async def run_in_pool(self, func, *args):
+        async with self.pending:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def _batch_fuel_jobs(self):
+        while True:
+            batch = [await self.fuel_jobs.get()]
+            deadline = asyncio.get_running_loop().time() + self.batch_window
+            while len(batch) < self.batch_size:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.fuel_jobs.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            task = asyncio.create_task(self._run_fuel_batch(batch))
+            self.batch_tasks.add(task)
+            task.add_done_callback(self.batch_tasks.discard)
+    # end _batch_fuel_jobs()
+
+    async def _run_fuel_batch(self, batch):
+        try:
+            answers = await self.run_in_pool(solve_fuel_batch, [job["masses"] for job, _ in batch],
+                                             [job["part"] for job, _ in batch])
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (_, future), (answer, error) in zip(batch, answers):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(answer)
+
+    async def submit(self, job):
+        """
+        Solve a job in the process pool.
+
+        :param job: A job dictionary as described in the module docstring.
+        :return: The answer.
+        """
+        if job.get("day") == 1:
+            check_fuel_job(job)
+            if self.batcher is None:
+                self.batcher = asyncio.create_task(self._batch_fuel_jobs())
+            future = asyncio.get_running_loop().create_future()
+            await self.fuel_jobs.put((job, future))
+            return await future
+        return await self.run_in_pool(solve, job)
+
+    async def _answer(self, line, writer, write_lock):
+        job_id = None
+        try:
+            job = json.loads(line)
+            job_id = job.get("id")
+            result = {"id": job_id, "answer": await self.submit(job)}
+        except Exception as error:
+            result = {"id": job_id, "error": f"{type(error).__name__}: {error}"}
+
+        async with write_lock:
+            writer.write((json.dumps(result) + "\n").encode())
+            await writer.drain()
+
+    async def handle_connection(self, reader, writer):
+        """
+        Read the jobs of a connection line by line and stream back their results as they are ready.
+        """
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    task = asyncio.create_task(self._answer(line, writer, write_lock))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+    # end handle_connection()
+
+    async def start(self, host="127.0.0.1", port=8765, unix_path=None):
+        """
+        Start listening on a TCP port, or on a Unix socket when unix_path is given.
+
+        :return: The asyncio server.
+        """
+        if unix_path is not None:
+            return await asyncio.start_unix_server(self.handle_connection, unix_path, limit=MAX_LINE)
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE)
+
+
+async def request(jobs, host="127.0.0.1", port=8765, unix_path=None):
+    """
+    Send jobs to a running service and collect their results.
+
+    :param jobs: Job dictionaries as described in the module docstring.
+    :return: The result dictionaries in the order they were received.
+    """
+    if unix_path is not None:
+        reader, writer = await asyncio.open_unix_connection(unix_path, limit=MAX_LINE)
+    else:
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+
+    for job in jobs:
+        writer.write((json.dumps(job) + "\n").encode())
+    await writer.drain()
+    writer.write_eof()
+
+    results = [json.loads(line) async for line in reader]
+    writer.close()
+    await writer.wait_closed()
+    return results
+# end request()
+
+
+async def serve(host, port, unix_path, workers):
+    service = SolverService(workers)
+    server = await service.start(host, port, unix_path)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m solver_service", description="Serve the solvers of all the days.")
+    parser.add_argument("--host", default="127.0.0.1", help="host to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port to listen on")
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--workers", type=int, help="number of worker processes (default: number of CPUs)")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.workers))
+    except KeyboardInterrupt:
+        pass
+# end main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Regression cases for Day2/linear_solver.py.
+"""
+
+from Day2 import intcode
+from Day2 import linear_solver
+from Day2 import question2
+
+
+def test_program_that_is_not_affine_falls_back_to_the_search():
+    # address 0 = memory[noun] + memory[verb]. The six probes all give 20, which fits a constant model with no
+    # solution for 110, but (5, 7) gives 10 + 100.
+    program = [1, 0, 0, 0, 99, 10, 10, 100, 10, 10]
+    nouns = verbs = range(5, 10)
+
+    assert question2.find_noun_verb(intcode.IntcodeVM(program), 110, nouns, verbs) == (5, 7)
+    assert linear_solver.solve_noun_verb(program, 110, nouns, verbs) == (5, 7)
+
+
+def test_unreachable_target_gives_none():
+    program = [1, 0, 0, 0, 99, 10, 10, 100, 10, 10]
+
+    assert linear_solver.solve_noun_verb(program, 111, range(5, 10), range(5, 10)) is None
+
+
+def test_puzzle_input():
+    assert linear_solver.solve_noun_verb(intcode.load_program(), 19690720) == (84, 78)
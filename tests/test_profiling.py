@@ -0,0 +1,21 @@
+"""
+Regression cases for profiling.py.
+"""
+
+import inspect
+
+import profiling
+from Day3 import closest_to_central
+
+
+def test_top_allocation_of_day3_is_taken_near_the_peak():
+    # No function is profiled on its own, so only the sampler thread can see the cells of the wires before they are
+    # freed.
+    _, report = profiling.profile_call(closest_to_central.main)
+
+    lines, first_line = inspect.getsourcelines(closest_to_central.create_line_coordinates)
+    top = report["top_allocations"][0]
+    assert top["file"] == inspect.getsourcefile(closest_to_central)
+    assert first_line <= top["line"] < first_line + len(lines)
+    # What is left of the cells when the session stops is only a small part of the peak.
+    assert top["bytes"] >= report["peak_bytes"] // 10